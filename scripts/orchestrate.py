@@ -8,6 +8,7 @@ learned creation rules.
 
 Usage:
     python scripts/orchestrate.py --intents intents.toml --duration 12
+    cd scripts && python -m orchestrate --intents intents.toml --duration 12
     python scripts/orchestrate.py --intents intents.toml --resume
     python scripts/orchestrate.py --intents intents.toml --dry-run
 """
@@ -16,35 +17,35 @@ from __future__ import annotations
 
 import argparse
 import os
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import signal
 import sys
+import threading
 import time
 
-# Allow imports from the scripts/ directory so the orchestrate package is found
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
+# Run as a script, the scripts/ directory is already sys.path[0], so the
+# orchestrate package below resolves without touching sys.path.
 from orchestrate.config import OrchestratorConfig
-from orchestrate.state import RunState, MonitorState, load_state, save_state_atomic
+from orchestrate.state import RunState, MonitorState, StateWAL, load_state, save_state_atomic
 from orchestrate.intents import load_intents, validate_intents
-from orchestrate.kto_client import KtoClient
-from orchestrate.server_bridge import ServerBridge
-from orchestrate.knowledge import KnowledgeBase
-from orchestrate.cycle import CycleRunner
-from orchestrate.report import generate_report
 from orchestrate.log import OrchestrationLogger
 
+# kto_client, server_bridge, knowledge, cycle and report are imported inside
+# main() after the --dry-run exit, so --help and --dry-run skip them.
+
 
 # ---------------------------------------------------------------------------
 # Signal handling
 # ---------------------------------------------------------------------------
 
-_shutdown_requested = False
+# Set on SIGINT/SIGTERM; the main loop sleeps on it so shutdown is immediate
+_shutdown_event = threading.Event()
 
 
 def _handle_signal(signum: int, frame) -> None:
-    """Set the global shutdown flag on SIGINT/SIGTERM."""
-    global _shutdown_requested
-    _shutdown_requested = True
+    """Set the global shutdown event on SIGINT/SIGTERM."""
+    _shutdown_event.set()
 
 
 # ---------------------------------------------------------------------------
@@ -98,7 +99,12 @@ def parse_args(argv: list | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--verbose",
         action="store_true",
-        help="Enable verbose logging",
+        help="Enable verbose logging (per-monitor scores in progress lines)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile monitor cycles with cProfile and write orchestrate.prof to the state dir",
     )
     parser.add_argument(
         "--e2e-server",
@@ -136,19 +142,37 @@ def _build_config(args: argparse.Namespace) -> OrchestratorConfig:
         resume=args.resume,
         dry_run=args.dry_run,
         verbose=args.verbose,
+        profile=args.profile,
         live_validate=args.live_validate,
         kto_binary=args.kto_binary,
     )
 
 
-def _state_file_path(state_dir: str) -> str:
-    """Return the canonical path for the run state file."""
-    return os.path.join(state_dir, "state.json")
-
-
-def _knowledge_file_path(state_dir: str) -> str:
-    """Return the canonical path for the knowledge base file."""
-    return os.path.join(state_dir, "knowledge.json")
+@dataclass(frozen=True)
+class RunPaths:
+    """Canonical file locations under the state directory, built once."""
+
+    state_dir: str
+    state: str
+    wal: str
+    knowledge: str
+    db: str
+    report: str
+    log: str
+    profile: str
+
+    @classmethod
+    def for_state_dir(cls, state_dir: str) -> "RunPaths":
+        return cls(
+            state_dir=state_dir,
+            state=os.path.join(state_dir, "state.json"),
+            wal=os.path.join(state_dir, "state.wal"),
+            knowledge=os.path.join(state_dir, "knowledge.json"),
+            db=os.path.join(state_dir, "test.db"),
+            report=os.path.join(state_dir, "report.txt"),
+            log=os.path.join(state_dir, "orchestrate.log"),
+            profile=os.path.join(state_dir, "orchestrate.prof"),
+        )
 
 
 def _min_interval(state: RunState) -> int:
@@ -157,12 +181,28 @@ def _min_interval(state: RunState) -> int:
     This determines how long the main loop sleeps between rounds.
     Defaults to 60 seconds if no monitors have an interval set.
     """
-    intervals = [
-        mon.interval_secs
-        for mon in state.monitors.values()
-        if mon.interval_secs > 0
-    ]
-    return min(intervals) if intervals else 60
+    return min(
+        (mon.interval_secs for mon in state.monitors.values() if mon.interval_secs > 0),
+        default=60,
+    )
+
+
+def _map_kto_calls(fn, items: list, max_workers: int) -> list:
+    """Run a kto call for every item concurrently, preserving input order.
+
+    ``fn`` must return a result dict with ``ok``/``error`` (as the
+    KtoClient watch-management methods do). Concurrent kto processes can
+    contend on the SQLite write lock, so failures other than timeouts are
+    retried once serially after the parallel pass.
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as ex:
+        results = list(ex.map(fn, items))
+    for i, item in enumerate(items):
+        if not results[i].get("ok") and results[i].get("error") != "timeout":
+            results[i] = fn(item)
+    return results
 
 
 # ---------------------------------------------------------------------------
@@ -172,8 +212,6 @@ def _min_interval(state: RunState) -> int:
 
 def main(argv: list | None = None) -> None:
     """Entry point for the learning loop orchestrator."""
-    global _shutdown_requested
-
     args = parse_args(argv)
     config = _build_config(args)
 
@@ -198,7 +236,7 @@ def main(argv: list | None = None) -> None:
     # ------------------------------------------------------------------
     print(f"Loading intents from {config.intents_path} ...")
     try:
-        intents = load_intents(config.intents_path)
+        intents = load_intents(config.intents_path, cache_dir=config.state_dir)
     except (FileNotFoundError, ValueError) as exc:
         log.error(f"Failed to load intents: {exc}")
         print(f"ERROR: {exc}", file=sys.stderr)
@@ -212,12 +250,15 @@ def main(argv: list | None = None) -> None:
         sys.exit(1)
 
     print(f"Loaded {len(intents)} intent(s)")
+    modes = set()
     for intent in intents:
         print(f"  - {intent.name} ({intent.intent_type}, {intent.mode})")
+        modes.add(intent.mode)
     log.info(f"Validated {len(intents)} intent(s)")
 
     # Determine run mode from intents (use first intent's mode, or "e2e")
     run_mode = intents[0].mode if intents else "e2e"
+    has_e2e = "e2e" in modes
 
     # ------------------------------------------------------------------
     # 3. Dry-run: show what would happen and exit
@@ -248,27 +289,43 @@ def main(argv: list | None = None) -> None:
         print("\n--- END DRY RUN ---")
         sys.exit(0)
 
+    from orchestrate.kto_client import KtoClient
+    from orchestrate.server_bridge import ServerBridge
+    from orchestrate.knowledge import KnowledgeBase, LOAD_LOADED, LOAD_MISSING
+    from orchestrate.cycle import CycleRunner
+    from orchestrate.report import generate_report
+
     # ------------------------------------------------------------------
     # 4. Initialize or resume state
     # ------------------------------------------------------------------
-    state_path = _state_file_path(config.state_dir)
+    paths = RunPaths.for_state_dir(config.state_dir)
+    state_path = paths.state
+    wal = StateWAL(paths.wal)
 
     if config.resume:
         state = load_state(state_path)
         if state is not None:
+            replayed = wal.replay(state)
+            if replayed:
+                # Fold the replayed deltas into a fresh checkpoint
+                save_state_atomic(state, state_path, durable=True)
+            wal.reset()
             print(f"Resumed state from {state_path} (run_id={state.run_id}, "
-                  f"cycles={state.total_cycles})")
+                  f"cycles={state.total_cycles}, replayed {replayed} WAL record(s))")
             log.info(
                 f"Resumed run {state.run_id} with {state.total_cycles} prior cycles",
                 run_id=state.run_id,
                 total_cycles=state.total_cycles,
+                wal_records=replayed,
             )
         else:
             print("No existing state file found, starting fresh")
             state = RunState(mode=run_mode)
+            wal.reset()
             log.info(f"No state to resume, created new run {state.run_id}")
     else:
         state = RunState(mode=run_mode)
+        wal.reset()
         log.info(f"Created new run {state.run_id}", run_id=state.run_id)
 
     print(f"Run ID: {state.run_id}")
@@ -276,25 +333,21 @@ def main(argv: list | None = None) -> None:
     # ------------------------------------------------------------------
     # 5. Set up knowledge base
     # ------------------------------------------------------------------
-    kb_path = _knowledge_file_path(config.state_dir)
+    kb_path = paths.knowledge
     knowledge = KnowledgeBase(kb_path)
-    if os.path.exists(kb_path):
-        loaded = knowledge.load()
-        if loaded:
-            removed = knowledge.apply_decay()
-            print(f"Loaded knowledge base: {knowledge.rule_count()} rule(s) "
-                  f"({removed} decayed)")
-            log.info(
-                f"Loaded knowledge base with {knowledge.rule_count()} rules, "
-                f"{removed} removed by decay",
-                rules=knowledge.rule_count(),
-                decayed=removed,
-            )
-        else:
-            print("Knowledge base exists but could not be loaded, starting fresh")
-            log.warn("Failed to load knowledge base, starting fresh")
-    else:
+    kb_status = knowledge.load()
+    if kb_status == LOAD_LOADED:
+        # Decay is applied lazily on lookup and compacted on save
+        print(f"Loaded knowledge base: {knowledge.rule_count()} rule(s)")
+        log.info(
+            f"Loaded knowledge base with {knowledge.rule_count()} rules",
+            rules=knowledge.rule_count(),
+        )
+    elif kb_status == LOAD_MISSING:
         print("No existing knowledge base, starting fresh")
+    else:
+        print("Knowledge base exists but could not be loaded, starting fresh")
+        log.warn("Failed to load knowledge base, starting fresh")
 
     # ------------------------------------------------------------------
     # 6. Set up kto client and server bridge
@@ -302,7 +355,6 @@ def main(argv: list | None = None) -> None:
     kto = KtoClient(config)
 
     server: ServerBridge | None = None
-    has_e2e = any(i.mode == "e2e" for i in intents)
 
     if has_e2e:
         server = ServerBridge(config.e2e_server_url)
@@ -329,15 +381,14 @@ def main(argv: list | None = None) -> None:
     # ------------------------------------------------------------------
     # 7. Create monitors in kto for each intent (if not resuming)
     # ------------------------------------------------------------------
-    db_path = os.path.join(config.state_dir, "test.db")
+    db_path = paths.db
 
     if not config.resume or not state.monitors:
         print(f"\nCreating {len(intents)} watch(es) in kto ...")
-        for intent in intents:
-            watch_name = f"{state.run_id}_{intent.name}"
 
-            result = kto.create_watch(
-                name=watch_name,
+        def _create(intent) -> dict:
+            return kto.create_watch(
+                name=f"{state.run_id}_{intent.name}",
                 url=intent.url,
                 engine=intent.engine,
                 extraction=intent.extraction,
@@ -348,6 +399,11 @@ def main(argv: list | None = None) -> None:
                 db_path=db_path,
             )
 
+        create_results = _map_kto_calls(_create, intents, config.kto_max_workers)
+
+        for intent, result in zip(intents, create_results):
+            watch_name = f"{state.run_id}_{intent.name}"
+
             if result.get("ok"):
                 print(f"  Created: {watch_name}")
                 log.info(f"Created watch '{watch_name}' for intent '{intent.name}'",
@@ -392,7 +448,7 @@ def main(argv: list | None = None) -> None:
             sys.exit(1)
 
         # Save initial state
-        save_state_atomic(state, state_path)
+        save_state_atomic(state, state_path, durable=True)
         print(f"\nInitialized {len(state.monitors)} monitor(s)")
     else:
         print(f"Resuming with {len(state.monitors)} existing monitor(s)")
@@ -419,12 +475,26 @@ def main(argv: list | None = None) -> None:
     # ------------------------------------------------------------------
     # 10. Main loop
     # ------------------------------------------------------------------
-    end_time = time.time() + config.duration_hours * 3600
+    # Loop timing uses the monotonic clock so wall-clock steps (NTP, DST)
+    # cannot stretch or cut short the run.
+    end_time = time.monotonic() + config.duration_hours * 3600
     sleep_interval = _min_interval(state)
-    last_save_time = time.time()
+    last_save_time = time.monotonic()
+    # Progress goes to stdout, which is block-buffered when piped; flush it
+    # on a timer rather than per line so a tail -f still sees progress.
+    last_flush_time = last_save_time
+    # Set whenever a round actually ran monitors; checkpoints are skipped
+    # while nothing has changed since the last one.
+    state_dirty = False
+    # With --profile, only run_all_monitors is profiled, accumulated across
+    # rounds so the dump reflects the whole run
+    profiler = None
+    if config.profile:
+        import cProfile
+        profiler = cProfile.Profile()
 
     print(f"\nStarting main loop (duration={config.duration_hours}h, "
-          f"sleep={sleep_interval}s between rounds)")
+          f"rounds wake when a monitor is due, min interval={sleep_interval}s)")
     print("Press Ctrl+C to stop gracefully\n")
     log.info(
         f"Main loop started: end_time in {config.duration_hours}h, "
@@ -434,42 +504,71 @@ def main(argv: list | None = None) -> None:
     )
 
     try:
-        while time.time() < end_time and not _shutdown_requested:
-            round_start = time.time()
+        while not _shutdown_event.is_set():
+            round_start = time.monotonic()
+            if round_start >= end_time:
+                break
 
             # Run one cycle across all due monitors
-            results = cycle_runner.run_all_monitors()
+            prev_experiment_ids = {
+                name: mon.active_experiment_id for name, mon in state.monitors.items()
+            }
+            if profiler is not None:
+                profiler.enable()
+            try:
+                results = cycle_runner.run_all_monitors()
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            if results:
+                wal.append(state, results.keys(), prev_experiment_ids)
 
-            # Print a brief progress line
+            # Print a brief progress line (per-monitor scores only with
+            # --verbose; they are always in the log via CycleRunner)
             if results:
-                scores_str = ", ".join(
-                    f"{name}={score.total:.3f}"
-                    for name, score in results.items()
-                )
-                print(f"[cycle {state.total_cycles}] Checked {len(results)} monitor(s): "
-                      f"{scores_str}")
+                state_dirty = True
+                if config.verbose:
+                    scores_str = ", ".join(
+                        f"{name}={score.total:.3f}"
+                        for name, score in results.items()
+                    )
+                    print(f"[cycle {state.total_cycles}] Checked {len(results)} monitor(s): "
+                          f"{scores_str}")
+                else:
+                    print(f"[cycle {state.total_cycles}] Checked {len(results)} monitor(s)")
             else:
                 print(f"[cycle {state.total_cycles}] No monitors due for check")
 
-            # Save state periodically (every 60 seconds)
-            now = time.time()
-            if now - last_save_time >= 60:
-                save_state_atomic(state, state_path)
+            # Each round's deltas are already in the WAL; compact them into a
+            # full checkpoint periodically or once the WAL grows too large
+            now = time.monotonic()
+            if state_dirty and (
+                now - last_save_time >= config.checkpoint_interval_secs
+                or wal.size >= config.wal_max_bytes
+            ):
+                save_state_atomic(state, state_path, durable=False)
+                wal.reset()
                 last_save_time = now
-
-            # Sleep until next round, checking for shutdown every second
-            elapsed = time.time() - round_start
-            remaining_sleep = max(0, sleep_interval - elapsed)
-            sleep_end = time.time() + remaining_sleep
-            while time.time() < sleep_end and not _shutdown_requested:
-                time.sleep(min(1.0, sleep_end - time.time()))
+                state_dirty = False
+            if now - last_flush_time >= 60:
+                sys.stdout.flush()
+                last_flush_time = now
+
+            # Sleep until the earliest monitor is due (never past the end of
+            # the run); a signal wakes the wait immediately. A monitor that
+            # came due while this round was running is picked up right away.
+            next_due = cycle_runner.seconds_until_next_due()
+            remaining_sleep = max(0, min(next_due, end_time - time.monotonic()))
+            log.flush()
+            if _shutdown_event.wait(timeout=remaining_sleep):
+                break
 
     except KeyboardInterrupt:
         # Belt-and-suspenders: handle KeyboardInterrupt even if signal
         # handler didn't fire (e.g., during sleep on some platforms)
-        _shutdown_requested = True
+        _shutdown_event.set()
 
-    if _shutdown_requested:
+    if _shutdown_event.is_set():
         print("\nShutdown requested, saving state ...")
         log.info("Graceful shutdown requested")
 
@@ -478,11 +577,18 @@ def main(argv: list | None = None) -> None:
     # ------------------------------------------------------------------
     print("\nFinalizing run ...")
 
-    save_state_atomic(state, state_path)
+    save_state_atomic(state, state_path, durable=True)
+    wal.reset()
     log.info(f"Final state saved to {state_path}", total_cycles=state.total_cycles)
     print(f"State saved ({state.total_cycles} total cycles)")
 
-    knowledge.save()
+    if profiler is not None:
+        profiler.dump_stats(paths.profile)
+        log.info(f"Profile written to {paths.profile}", path=paths.profile)
+        print(f"Profile written to {paths.profile} "
+              f"(inspect with: python -m pstats {paths.profile})")
+
+    knowledge.save(durable=True)
     log.info(
         f"Knowledge base saved with {knowledge.rule_count()} rule(s)",
         rules=knowledge.rule_count(),
@@ -498,8 +604,13 @@ def main(argv: list | None = None) -> None:
     # ------------------------------------------------------------------
     if not config.resume:
         print("\nCleaning up test watches ...")
-        for monitor_name, monitor in state.monitors.items():
-            result = kto.delete_watch(monitor.watch_name, db_path=db_path)
+        monitors = list(state.monitors.values())
+        delete_results = _map_kto_calls(
+            lambda mon: kto.delete_watch(mon.watch_name, db_path=db_path),
+            monitors,
+            config.kto_max_workers,
+        )
+        for monitor, result in zip(monitors, delete_results):
             if result.get("ok"):
                 log.info(f"Deleted watch '{monitor.watch_name}'",
                          watch_name=monitor.watch_name)
@@ -523,8 +634,10 @@ def main(argv: list | None = None) -> None:
     print(f"  Rules learned:  {knowledge.rule_count()}")
     print(f"  State:          {state_path}")
     print(f"  Knowledge:      {kb_path}")
-    print(f"  Report:         {os.path.join(config.state_dir, 'report.txt')}")
-    print(f"  Logs:           {os.path.join(config.state_dir, 'orchestrate.log')}")
+    print(f"  Report:         {paths.report}")
+    print(f"  Logs:           {paths.log}")
+    if profiler is not None:
+        print(f"  Profile:        {paths.profile}")
 
     log.info(
         f"Run {state.run_id} complete: {state.total_cycles} cycles, "
@@ -533,6 +646,7 @@ def main(argv: list | None = None) -> None:
         total_cycles=state.total_cycles,
         rules_learned=knowledge.rule_count(),
     )
+    log.close()
 
 
 if __name__ == "__main__":
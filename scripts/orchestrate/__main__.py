@@ -0,0 +1,14 @@
+"""Support ``python -m orchestrate`` (from scripts/) as an alias for
+``python scripts/orchestrate.py``.
+
+The entry script shares the package's name, so it cannot be imported as a
+module; run it by path instead.
+"""
+
+import os
+import runpy
+
+runpy.run_path(
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "orchestrate.py"),
+    run_name="__main__",
+)
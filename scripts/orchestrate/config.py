@@ -7,8 +7,14 @@ module imports from here and state.py.
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# Per-cycle records and knowledge rules are declared with
+# @dataclass(**DATACLASS_SLOTS): slotted (no per-instance __dict__) on
+# Python 3.10+, plain dataclasses before that
+DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 # =============================================================================
@@ -26,12 +32,17 @@ class OrchestratorConfig:
     resume: bool = False
     dry_run: bool = False
     verbose: bool = False
+    profile: bool = False  # cProfile run_all_monitors, dump to orchestrate.prof
     live_validate: bool = False
     kto_binary: str = "kto"
     kto_timeout_secs: int = 120
+    kto_max_workers: int = 8  # concurrent kto processes for watch setup/cleanup
+    max_parallel_monitors: int = 8  # concurrent kto checks per round (live mode)
     claude_timeout_secs: int = 60
     max_evidence_per_monitor: int = 100
     log_max_bytes: int = 10 * 1024 * 1024  # 10MB
+    checkpoint_interval_secs: int = 600  # full state.json rewrite; WAL in between
+    wal_max_bytes: int = 4 * 1024 * 1024  # 4MB, forces an early checkpoint
 
 
 # =============================================================================
@@ -56,6 +67,23 @@ LIVE_INTENT_WEIGHTS: Dict[str, Dict[str, float]] = {
     "generic": {"f1": 0.65, "agent": 0.00, "latency": 0.15, "stability": 0.20},
 }
 
+# Weight profiles precompiled into positional vectors so scoring is a dot
+# product over (f1, agent, latency, stability) instead of keyed lookups
+WEIGHT_COMPONENTS: Tuple[str, ...] = ("f1", "agent", "latency", "stability")
+
+
+def _weight_vectors(
+    profiles: Dict[str, Dict[str, float]]
+) -> Dict[str, Tuple[float, ...]]:
+    return {
+        intent: tuple(weights.get(c, 0.0) for c in WEIGHT_COMPONENTS)
+        for intent, weights in profiles.items()
+    }
+
+
+INTENT_WEIGHT_VECTORS: Dict[str, Tuple[float, ...]] = _weight_vectors(INTENT_WEIGHTS)
+LIVE_INTENT_WEIGHT_VECTORS: Dict[str, Tuple[float, ...]] = _weight_vectors(LIVE_INTENT_WEIGHTS)
+
 
 # =============================================================================
 # SLA Map (maximum acceptable cycles before detection)
@@ -70,6 +98,60 @@ INTENT_SLA: Dict[str, int] = {
 }
 
 
+# =============================================================================
+# Stability thresholds (acceptable stdev of recent scores)
+# =============================================================================
+
+# Volatile intents (price, stock) tolerate more score variance
+INTENT_STABILITY_THRESHOLDS: Dict[str, float] = {
+    "price": 0.3,
+    "stock": 0.3,
+    "release": 0.2,
+    "news": 0.2,
+    "generic": 0.2,
+}
+
+
+# =============================================================================
+# Resolved per-intent scoring config
+# =============================================================================
+
+@dataclass(frozen=True)
+class IntentScoring:
+    """Scoring parameters for one intent type, resolved once per monitor."""
+
+    e2e_weights: Tuple[float, ...]
+    live_weights: Tuple[float, ...]
+    sla_cycles: int
+    stability_threshold: float
+
+
+_RESOLVED_INTENT_CONFIG: Dict[str, IntentScoring] = {}
+
+
+def resolve_intent_config(intent_type: str) -> IntentScoring:
+    """Resolve weights, SLA, and stability threshold for an intent type.
+
+    Unknown intent types fall back to the "generic" weight profiles, an
+    SLA of 3 cycles, and a 0.2 stability threshold. Results are shared
+    between monitors of the same intent type.
+    """
+    resolved = _RESOLVED_INTENT_CONFIG.get(intent_type)
+    if resolved is None:
+        resolved = IntentScoring(
+            e2e_weights=INTENT_WEIGHT_VECTORS.get(
+                intent_type, INTENT_WEIGHT_VECTORS["generic"]
+            ),
+            live_weights=LIVE_INTENT_WEIGHT_VECTORS.get(
+                intent_type, LIVE_INTENT_WEIGHT_VECTORS["generic"]
+            ),
+            sla_cycles=INTENT_SLA.get(intent_type, 3),
+            stability_threshold=INTENT_STABILITY_THRESHOLDS.get(intent_type, 0.2),
+        )
+        _RESOLVED_INTENT_CONFIG[intent_type] = resolved
+    return resolved
+
+
 # =============================================================================
 # Per-intent default check intervals (seconds)
 # =============================================================================
@@ -126,7 +208,7 @@ MIN_POSITIVE_EVENTS_FOR_PROMOTION: int = 5
 # Creation Recommendation (output of knowledge lookup)
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CreationRecommendation:
     """Recommendation for how to create a new monitor."""
 
@@ -137,25 +219,31 @@ class CreationRecommendation:
     selector: Optional[str] = None
 
     def to_dict(self) -> dict:
-        d = {}
-        if self.engine is not None:
-            d["engine"] = self.engine
-        if self.extraction is not None:
-            d["extraction"] = self.extraction
-        if self.interval_secs is not None:
-            d["interval_secs"] = self.interval_secs
-        if self.instruction_template is not None:
-            d["instruction_template"] = self.instruction_template
-        if self.selector is not None:
-            d["selector"] = self.selector
-        return d
+        d = {
+            "engine": self.engine,
+            "extraction": self.extraction,
+            "interval_secs": self.interval_secs,
+            "instruction_template": self.instruction_template,
+            "selector": self.selector,
+        }
+        return {k: v for k, v in d.items() if v is not None}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "CreationRecommendation":
+        return cls(
+            engine=d.get("engine"),
+            extraction=d.get("extraction"),
+            interval_secs=d.get("interval_secs"),
+            instruction_template=d.get("instruction_template"),
+            selector=d.get("selector"),
+        )
 
 
 # =============================================================================
 # Creation Rule (learned from experiments)
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CreationRule:
     """A rule learned from experimentation, stored in knowledge.json."""
 
@@ -172,8 +260,18 @@ class CreationRule:
     source_domains: List[str] = field(default_factory=list)
     created_at: str = ""
     last_validated: str = ""
+    # When ``confidence`` was last decayed; decay since then is applied
+    # lazily (empty = anchored at last_validated)
+    last_decayed: str = ""
     rule_type: str = "heuristic"  # "structural", "heuristic", "domain"
 
+    # Decay anchor (last_decayed or last_validated) as a UNIX epoch, paired
+    # with the string it was parsed from so a changed anchor is re-parsed;
+    # not persisted
+    _anchor: Tuple[str, Optional[float]] = field(
+        default=("", None), init=False, compare=False, repr=False
+    )
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -189,19 +287,13 @@ class CreationRule:
             "source_domains": self.source_domains,
             "created_at": self.created_at,
             "last_validated": self.last_validated,
+            "last_decayed": self.last_decayed,
             "rule_type": self.rule_type,
         }
 
     @classmethod
     def from_dict(cls, d: dict) -> "CreationRule":
-        rec_data = d.get("recommendation", {})
-        rec = CreationRecommendation(
-            engine=rec_data.get("engine"),
-            extraction=rec_data.get("extraction"),
-            interval_secs=rec_data.get("interval_secs"),
-            instruction_template=rec_data.get("instruction_template"),
-            selector=rec_data.get("selector"),
-        )
+        rec = CreationRecommendation.from_dict(d.get("recommendation", {}))
         return cls(
             id=d.get("id", ""),
             intent_type=d.get("intent_type", ""),
@@ -216,6 +308,7 @@ class CreationRule:
             source_domains=d.get("source_domains", []),
             created_at=d.get("created_at", ""),
             last_validated=d.get("last_validated", ""),
+            last_decayed=d.get("last_decayed", ""),
             rule_type=d.get("rule_type", "heuristic"),
         )
 
@@ -224,7 +317,7 @@ class CreationRule:
 # Efficacy Score
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EfficacyScore:
     """Composite efficacy score for a monitor cycle."""
 
@@ -241,7 +334,7 @@ class EfficacyScore:
 # Intent Definition (loaded from TOML)
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class IntentDefinition:
     """Definition of an intent to monitor, loaded from TOML."""
 
@@ -281,7 +374,7 @@ class IntentDefinition:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MutationStep:
     """A single mutation to apply during E2E testing."""
 
@@ -11,42 +11,52 @@ from __future__ import annotations
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from .config import (
     OrchestratorConfig,
     IntentDefinition,
-    CreationRule,
     EfficacyScore,
-    INTENT_INTERVALS,
     MutationStep,
 )
-from .state import (
-    RunState,
-    MonitorState,
-    Observation,
-    Evaluation,
-    Experiment,
-    save_state_atomic,
-)
-from .kto_client import KtoClient
-from .server_bridge import ServerBridge
+from .state import MonitorState, Observation, utc_iso_now
 from .evaluator import evaluate_e2e, evaluate_live, update_monitor_stats
-from .efficacy import compute_efficacy, classify_observation
+from .efficacy import compute_efficacy
 from .experimenter import (
+    TERMINAL_STATUSES,
     get_current_variant,
     record_observation,
     conclude_experiment,
     plan_next_experiment,
-    create_experiment,
 )
-from .knowledge import KnowledgeBase
-from .log import OrchestrationLogger
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing them at runtime would pull in
+    # urllib.request (server_bridge) and subprocess (kto_client) for anyone
+    # importing CycleRunner. Callers pass in instances they already built.
+    from .state import RunState, Experiment
+    from .kto_client import KtoClient
+    from .server_bridge import ServerBridge
+    from .knowledge import KnowledgeBase
+    from .log import OrchestrationLogger
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _PendingCycle:
+    """A cycle that has been started (steps a-d) but not yet observed."""
+
+    monitor_name: str
+    monitor: MonitorState
+    intent: IntentDefinition
+    cycle: int
+    active_experiment: Optional[Experiment]
+
+
 class CycleRunner:
     """Runs observe -> evaluate -> experiment -> learn cycles for monitors.
 
@@ -79,27 +89,182 @@ class CycleRunner:
             intent.name: intent for intent in intents
         }
 
-        # Track which mutations have been applied per monitor
-        self.applied_mutations: Dict[str, List[MutationStep]] = {}
+        # Mutation schedule per monitor, keyed by the cycle it fires on
+        self.mutations_by_cycle: Dict[str, Dict[int, List[MutationStep]]] = {}
+        for intent in intents:
+            schedule: Dict[int, List[MutationStep]] = {}
+            for mutation in intent.mutations:
+                schedule.setdefault(mutation.cycle, []).append(mutation)
+            self.mutations_by_cycle[intent.name] = schedule
+
+        # Finished experiments per monitor, fed to plan_next_experiment.
+        # Seeded from state (for --resume) and appended to as experiments
+        # end, so planning never rescans every experiment in the run.
+        self.concluded_by_monitor: Dict[str, List[Experiment]] = {}
+        for exp in state.experiments.values():
+            if exp.status in TERMINAL_STATUSES:
+                self.concluded_by_monitor.setdefault(exp.monitor_name, []).append(exp)
+
+        # Most recent applied mutation with expect_detection=True, per
+        # monitor -- the only part of the applied history evaluate_e2e needs
+        self.last_trigger: Dict[str, MutationStep] = {}
+
+        # Set when a concluded experiment added a rule; the knowledge base is
+        # written once at the end of run_all_monitors rather than per rule
+        self.knowledge_dirty = False
+
+        # Monotonic time each monitor is next due, set when it is checked so
+        # the scheduler's "is it due?" test is a single comparison. Not
+        # persisted: seeded from the ISO observation timestamp on first use
+        # after a resume, then kept as a float.
+        self._next_due_mono: Dict[str, float] = {}
 
     # =========================================================================
     # Public API
     # =========================================================================
 
-    def run_cycle(self, monitor_name: str) -> Optional[EfficacyScore]:
+    def run_cycle(
+        self,
+        monitor_name: str,
+        monitor: Optional[MonitorState] = None,
+        intent: Optional[IntentDefinition] = None,
+    ) -> Optional[EfficacyScore]:
         """Run a single observe -> evaluate -> experiment -> learn cycle.
 
         Args:
             monitor_name: Name of the monitor to run a cycle for.
+            monitor: The monitor's state, if the caller already has it.
+            intent: The monitor's IntentDefinition, if the caller already
+                has it.
 
         Returns:
             The computed EfficacyScore, or None if the monitor or intent
             is not found.
         """
+        pending = self._begin_cycle(monitor_name, monitor, intent)
+        if pending is None:
+            return None
+        return self._finish_cycle(pending, self._observe(pending))
+
+    def run_all_monitors(self) -> Dict[str, EfficacyScore]:
+        """Run one cycle for each monitor that is due for a check.
+
+        Respects per-intent intervals: a monitor is only checked if enough
+        time has elapsed since its last observation.
+
+        When several monitors are due and none of them mutates the test
+        server, their kto checks run concurrently (up to
+        config.max_parallel_monitors); everything that touches shared state
+        (cycle counters, evaluation, experiments, knowledge) still runs
+        serially, in monitor order.
+
+        Returns:
+            Dict mapping monitor_name to its EfficacyScore for monitors
+            that were checked this round. Monitors that were skipped
+            (not yet due) are omitted.
+        """
+        results: Dict[str, EfficacyScore] = {}
+        # Bound once: both loops below run per monitor
+        monitors = self.state.monitors
+        intent_map = self.intent_map
+
+        due: List[str] = []
+        for monitor_name, monitor in monitors.items():
+            if not self._should_run_monitor(monitor):
+                logger.debug(
+                    "Skipping monitor '%s': not yet due for check",
+                    monitor_name,
+                )
+                continue
+            due.append(monitor_name)
+
+        if self._can_observe_in_parallel(due):
+            pending = [
+                p for p in (
+                    self._begin_cycle(name, monitors[name], intent_map.get(name))
+                    for name in due
+                )
+                if p is not None
+            ]
+            workers = min(self.config.max_parallel_monitors, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                observations = list(pool.map(self._observe, pending))
+
+            for p, observation in zip(pending, observations):
+                # Concurrent checks share one SQLite DB; retry lock-style
+                # failures serially (a timeout would just time out again)
+                if observation.error is not None and observation.error != "timeout":
+                    observation = self._observe(p)
+                results[p.monitor_name] = self._finish_cycle(p, observation)
+        else:
+            for monitor_name in due:
+                score = self.run_cycle(
+                    monitor_name,
+                    monitor=monitors[monitor_name],
+                    intent=intent_map.get(monitor_name),
+                )
+                if score is not None:
+                    results[monitor_name] = score
+
+        self.flush_knowledge()
+        return results
+
+    def flush_knowledge(self) -> None:
+        """Save the knowledge base if any rule was added since the last save."""
+        if self.knowledge_dirty:
+            self.knowledge.save()
+            self.knowledge_dirty = False
+
+    def seconds_until_next_due(self) -> float:
+        """Return how long until the earliest monitor becomes due.
+
+        Lets the main loop sleep exactly until there is work, instead of a
+        fixed interval that can wake just before a monitor is due.
+
+        Monitors without an IntentDefinition are ignored: run_cycle can never
+        check them, so they would otherwise stay due forever.
+
+        Returns:
+            Seconds until the next check (0.0 if a monitor is due now, 60.0
+            if there are no runnable monitors).
+        """
+        now = time.monotonic()
+        intent_map = self.intent_map
+        earliest: Optional[float] = None
+        for monitor_name, monitor in self.state.monitors.items():
+            if monitor_name not in intent_map:
+                continue
+            remaining = self._seconds_until_due(monitor, now)
+            if remaining <= 0:
+                return 0.0
+            if earliest is None or remaining < earliest:
+                earliest = remaining
+        return earliest if earliest is not None else 60.0
+
+    def get_db_path(self) -> str:
+        """Return the path to the isolated test database.
+
+        Returns:
+            Absolute path to ``{config.state_dir}/test.db``.
+        """
+        return os.path.join(self.config.state_dir, "test.db")
+
+    # =========================================================================
+    # Cycle phases (run_cycle = begin -> observe -> finish)
+    # =========================================================================
+
+    def _begin_cycle(
+        self,
+        monitor_name: str,
+        monitor: Optional[MonitorState],
+        intent: Optional[IntentDefinition],
+    ) -> Optional[_PendingCycle]:
+        """Steps a-d: resolve, bump the cycle count, mutate, pick variant."""
         # -----------------------------------------------------------------
         # a. Resolve monitor and intent
         # -----------------------------------------------------------------
-        monitor = self.state.monitors.get(monitor_name)
+        if monitor is None:
+            monitor = self.state.monitors.get(monitor_name)
         if monitor is None:
             self.logger.error(
                 f"Monitor '{monitor_name}' not found in state",
@@ -107,7 +272,8 @@ class CycleRunner:
             )
             return None
 
-        intent = self.intent_map.get(monitor_name)
+        if intent is None:
+            intent = self.intent_map.get(monitor_name)
         if intent is None:
             self.logger.error(
                 f"IntentDefinition not found for monitor '{monitor_name}'",
@@ -121,35 +287,34 @@ class CycleRunner:
         monitor.cycle_count += 1
         cycle = monitor.cycle_count
 
-        # Ensure applied_mutations list exists for this monitor
-        if monitor_name not in self.applied_mutations:
-            self.applied_mutations[monitor_name] = []
-
         # -----------------------------------------------------------------
         # c. Apply mutation (E2E only)
         # -----------------------------------------------------------------
         if intent.mode == "e2e" and self.server is not None:
-            for mutation in intent.mutations:
-                if mutation.cycle == cycle:
-                    ok = self.server.apply_mutation(mutation)
-                    if ok:
-                        self.applied_mutations[monitor_name].append(mutation)
-                        self.logger.info(
-                            f"[{monitor_name}] Applied mutation at cycle {cycle}: "
-                            f"{mutation.description or mutation.field}={mutation.value}",
-                            monitor=monitor_name,
-                            cycle=cycle,
-                            mutation_field=mutation.field,
-                            mutation_value=mutation.value,
-                        )
-                    else:
-                        self.logger.error(
-                            f"[{monitor_name}] Failed to apply mutation at cycle {cycle}: "
-                            f"{mutation.field}={mutation.value}",
-                            monitor=monitor_name,
-                            cycle=cycle,
-                            mutation_field=mutation.field,
-                        )
+            for mutation in self.mutations_by_cycle[monitor_name].get(cycle, ()):
+                ok = self.server.apply_mutation(mutation)
+                if ok:
+                    # Mutations apply in cycle order; within a cycle the
+                    # first triggering one is kept
+                    last = self.last_trigger.get(monitor_name)
+                    if mutation.expect_detection and (last is None or mutation.cycle > last.cycle):
+                        self.last_trigger[monitor_name] = mutation
+                    self.logger.info(
+                        f"[{monitor_name}] Applied mutation at cycle {cycle}: "
+                        f"{mutation.description or mutation.field}={mutation.value}",
+                        monitor=monitor_name,
+                        cycle=cycle,
+                        mutation_field=mutation.field,
+                        mutation_value=mutation.value,
+                    )
+                else:
+                    self.logger.error(
+                        f"[{monitor_name}] Failed to apply mutation at cycle {cycle}: "
+                        f"{mutation.field}={mutation.value}",
+                        monitor=monitor_name,
+                        cycle=cycle,
+                        mutation_field=mutation.field,
+                    )
 
         # -----------------------------------------------------------------
         # d. Determine active experiment variant
@@ -157,10 +322,9 @@ class CycleRunner:
         active_experiment: Optional[Experiment] = None
         active_variant: Optional[str] = None
 
-        if monitor.active_experiment_id:
-            active_experiment = self.state.experiments.get(
-                monitor.active_experiment_id
-            )
+        active_id = monitor.active_experiment_id
+        if active_id:
+            active_experiment = self.state.experiments.get(active_id)
             if active_experiment is not None:
                 active_variant = get_current_variant(active_experiment, cycle)
                 if active_variant is not None:
@@ -172,18 +336,39 @@ class CycleRunner:
                         active_variant,
                     )
 
+        return _PendingCycle(monitor_name, monitor, intent, cycle, active_experiment)
+
+    def _observe(self, pending: _PendingCycle) -> Observation:
+        """Step e (I/O only): run the kto check and stamp the observation.
+
+        Touches no shared state besides the monitor's scheduling entry, so
+        run_all_monitors may call it from worker threads.
+        """
+        observation = self.kto.run_check(
+            pending.monitor.watch_name, db_path=self.get_db_path()
+        )
+        observation.cycle = pending.cycle
+        observation.timestamp = utc_iso_now()
+        self._next_due_mono[pending.monitor.name] = (
+            time.monotonic() + pending.monitor.interval_secs
+        )
+        return observation
+
+    def _finish_cycle(
+        self, pending: _PendingCycle, observation: Observation
+    ) -> EfficacyScore:
+        """Steps e-l: record, evaluate, score, experiment, learn, log."""
+        monitor_name = pending.monitor_name
+        monitor = pending.monitor
+        intent = pending.intent
+        cycle = pending.cycle
+        active_experiment = pending.active_experiment
+
         # -----------------------------------------------------------------
-        # e. Observe: run kto check
+        # e. Record observation
         # -----------------------------------------------------------------
-        db_path = self.get_db_path()
-        observation = self.kto.run_check(monitor.watch_name, db_path=db_path)
-        observation.cycle = cycle
-        observation.timestamp = datetime.utcnow().isoformat()
-
-        # Append to monitor observations (capped at 100 by state serialization)
+        # Append to monitor observations (bounded deque evicts the oldest)
         monitor.observations.append(observation)
-        if len(monitor.observations) > 100:
-            monitor.observations = monitor.observations[-100:]
 
         # -----------------------------------------------------------------
         # f. Evaluate
@@ -193,15 +378,13 @@ class CycleRunner:
                 monitor,
                 observation,
                 intent,
-                self.applied_mutations.get(monitor_name, []),
+                self.last_trigger.get(monitor_name),
             )
         else:
             evaluation = evaluate_live(monitor, observation)
 
-        # Append to monitor evaluations (capped at 100)
+        # Append to monitor evaluations (bounded deque evicts the oldest)
         monitor.evaluations.append(evaluation)
-        if len(monitor.evaluations) > 100:
-            monitor.evaluations = monitor.evaluations[-100:]
 
         # -----------------------------------------------------------------
         # g. Score
@@ -225,11 +408,15 @@ class CycleRunner:
             )
 
             rule = conclude_experiment(active_experiment)
+            if active_experiment.status in TERMINAL_STATUSES:
+                self.concluded_by_monitor.setdefault(monitor_name, []).append(
+                    active_experiment
+                )
 
             if rule is not None:
                 # Experiment concluded with a winner -- add rule to knowledge base
                 self.knowledge.add_rule(rule)
-                self.knowledge.save()
+                self.knowledge_dirty = True
                 self.logger.learning(
                     f"[{monitor_name}] Experiment {active_experiment.id} concluded: "
                     f"winner='{active_experiment.winner}', "
@@ -243,7 +430,7 @@ class CycleRunner:
                 # Clear the active experiment
                 monitor.active_experiment_id = None
 
-            elif active_experiment.status in ("concluded", "insufficient_data"):
+            elif active_experiment.status in TERMINAL_STATUSES:
                 # Experiment concluded without a usable rule, or insufficient data
                 self.logger.info(
                     f"[{monitor_name}] Experiment {active_experiment.id} ended: "
@@ -258,19 +445,11 @@ class CycleRunner:
         # j. Plan next experiment (if no active experiment)
         # -----------------------------------------------------------------
         if monitor.active_experiment_id is None:
-            # Gather concluded experiments for this monitor
-            concluded = [
-                exp
-                for exp in self.state.experiments.values()
-                if exp.monitor_name == monitor_name
-                and exp.status in ("concluded", "insufficient_data")
-            ]
-
             next_experiment = plan_next_experiment(
                 monitor_name,
                 intent.intent_type,
                 monitor.current_config,
-                concluded,
+                self.concluded_by_monitor.get(monitor_name, []),
             )
 
             if next_experiment is not None:
@@ -316,45 +495,26 @@ class CycleRunner:
         # -----------------------------------------------------------------
         return score
 
-    def run_all_monitors(self) -> Dict[str, EfficacyScore]:
-        """Run one cycle for each monitor that is due for a check.
-
-        Respects per-intent intervals: a monitor is only checked if enough
-        time has elapsed since its last observation.
-
-        Returns:
-            Dict mapping monitor_name to its EfficacyScore for monitors
-            that were checked this round. Monitors that were skipped
-            (not yet due) are omitted.
-        """
-        results: Dict[str, EfficacyScore] = {}
-
-        for monitor_name, monitor in self.state.monitors.items():
-            if not self._should_run_monitor(monitor):
-                logger.debug(
-                    "Skipping monitor '%s': not yet due for check",
-                    monitor_name,
-                )
-                continue
-
-            score = self.run_cycle(monitor_name)
-            if score is not None:
-                results[monitor_name] = score
-
-        return results
-
-    def get_db_path(self) -> str:
-        """Return the path to the isolated test database.
-
-        Returns:
-            Absolute path to ``{config.state_dir}/test.db``.
-        """
-        return os.path.join(self.config.state_dir, "test.db")
-
     # =========================================================================
     # Internal helpers
     # =========================================================================
 
+    def _can_observe_in_parallel(self, due: List[str]) -> bool:
+        """Whether this round's kto checks can safely run concurrently.
+
+        E2E monitors with a server share its pages, so mutation -> check
+        ordering between them must stay serial.
+        """
+        if len(due) < 2 or self.config.max_parallel_monitors < 2:
+            return False
+        if self.server is None:
+            return True
+        for monitor_name in due:
+            intent = self.intent_map.get(monitor_name)
+            if intent is not None and intent.mode == "e2e":
+                return False
+        return True
+
     def _should_run_monitor(self, monitor: MonitorState) -> bool:
         """Check if enough time has elapsed since the monitor's last observation.
 
@@ -368,20 +528,40 @@ class CycleRunner:
         Returns:
             True if the monitor should be checked now, False otherwise.
         """
-        if not monitor.observations:
-            return True
+        next_due = self._next_due_mono.get(monitor.name)
+        if next_due is not None:
+            return time.monotonic() >= next_due
+        return self._seconds_until_due(monitor, time.monotonic()) <= 0
 
-        last_obs = monitor.observations[-1]
-        if not last_obs.timestamp:
-            return True
+    def _seconds_until_due(self, monitor: MonitorState, now: float) -> float:
+        """Return seconds until *monitor* is next due (<= 0 means due now).
 
-        try:
-            last_time = datetime.fromisoformat(last_obs.timestamp)
-            now = datetime.utcnow()
-            elapsed_secs = (now - last_time).total_seconds()
-        except (ValueError, TypeError):
-            # If we cannot parse the timestamp, run the check
-            return True
+        A monitor with no observations, or whose last timestamp is missing
+        or unparseable, is due immediately.
 
-        interval = monitor.interval_secs
-        return elapsed_secs >= interval
+        Args:
+            monitor: The monitor state to check.
+            now: Current ``time.monotonic()`` reading.
+        """
+        next_due = self._next_due_mono.get(monitor.name)
+        if next_due is None:
+            if not monitor.observations:
+                return 0.0
+
+            last_obs = monitor.observations[-1]
+            if not last_obs.timestamp:
+                return 0.0
+
+            try:
+                last_time = datetime.fromisoformat(last_obs.timestamp)
+                elapsed_secs = (datetime.utcnow() - last_time).total_seconds()
+            except (ValueError, TypeError):
+                # If we cannot parse the timestamp, run the check
+                return 0.0
+
+            # Resumed monitor: parse the ISO timestamp once, then schedule
+            # off the monotonic clock like any other
+            next_due = now - elapsed_secs + monitor.interval_secs
+            self._next_due_mono[monitor.name] = next_due
+
+        return next_due - now
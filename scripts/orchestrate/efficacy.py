@@ -7,10 +7,10 @@ detection latency, stability, and (in E2E mode) agent decision accuracy.
 from __future__ import annotations
 
 import math
-from statistics import stdev
+from itertools import islice
 from typing import List
 
-from .config import EfficacyScore, INTENT_WEIGHTS, LIVE_INTENT_WEIGHTS, INTENT_SLA
+from .config import EfficacyScore
 from .state import MonitorState
 
 
@@ -29,26 +29,17 @@ def compute_efficacy(monitor: MonitorState, mode: str) -> EfficacyScore:
     Returns:
         An EfficacyScore with all component scores and the weighted total.
     """
-    # --- a/b/c/d: Precision, recall, F1 from confusion matrix ---
-    tp = monitor.tp
-    tn = monitor.tn
-    fp = monitor.fp
-    fn = monitor.fn
-
-    precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-    recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-    f1 = (
-        2.0 * (precision * recall) / (precision + recall)
-        if (precision + recall) > 0
-        else 0.0
-    )
+    # --- a/b/c/d: Precision, recall, F1 (maintained by update_monitor_stats) ---
+    precision = monitor.precision
+    recall = monitor.recall
+    f1 = monitor.f1
+
+    scoring = monitor.scoring
 
     # --- e: Latency score (normalized by SLA) ---
-    sla_cycles = INTENT_SLA.get(monitor.intent_type, 3)
+    sla_cycles = scoring.sla_cycles
     if monitor.detection_latencies:
-        avg_latency = sum(monitor.detection_latencies) / len(
-            monitor.detection_latencies
-        )
+        avg_latency = monitor.avg_detection_latency
     else:
         avg_latency = float(sla_cycles)
 
@@ -64,22 +55,17 @@ def compute_efficacy(monitor: MonitorState, mode: str) -> EfficacyScore:
     else:
         agent_score = 0.0
 
-    # --- h: Select weights based on mode ---
-    if mode == "e2e":
-        weights = INTENT_WEIGHTS.get(
-            monitor.intent_type, INTENT_WEIGHTS["generic"]
-        )
-    else:
-        weights = LIVE_INTENT_WEIGHTS.get(
-            monitor.intent_type, LIVE_INTENT_WEIGHTS["generic"]
-        )
+    # --- h: Select weight vector based on mode ---
+    w_f1, w_agent, w_latency, w_stability = (
+        scoring.e2e_weights if mode == "e2e" else scoring.live_weights
+    )
 
     # --- i: Weighted total ---
     total = (
-        weights["f1"] * f1
-        + weights.get("agent", 0) * agent_score
-        + weights["latency"] * latency_score
-        + weights["stability"] * stability_score
+        w_f1 * f1
+        + w_agent * agent_score
+        + w_latency * latency_score
+        + w_stability * stability_score
     )
 
     # --- j: Return EfficacyScore ---
@@ -113,18 +99,18 @@ def compute_stability(monitor: MonitorState) -> float:
         return 1.0
 
     # Use the last 10 scores
-    recent: List[float] = monitor.scores[-10:]
+    scores = monitor.scores
+    recent: List[float] = list(islice(scores, max(len(scores) - 10, 0), None))
 
-    # Compute standard deviation
-    std_dev = stdev(recent)
+    # Sample standard deviation, two-pass: over at most 10 floats this is
+    # cheaper than statistics.stdev (which goes through exact Fraction
+    # arithmetic) and avoids the cancellation of a running sum-of-squares
+    n = len(recent)
+    mean = sum(recent) / n
+    std_dev = math.sqrt(sum((x - mean) ** 2 for x in recent) / (n - 1))
 
     # Intent-aware volatility threshold
-    if monitor.intent_type in ("price", "stock"):
-        threshold = 0.3
-    elif monitor.intent_type in ("release", "news"):
-        threshold = 0.2
-    else:
-        threshold = 0.2
+    threshold = monitor.scoring.stability_threshold
 
     stability = 1.0 - min(std_dev / threshold, 1.0)
     stability = max(0.0, min(1.0, stability))
@@ -132,6 +118,10 @@ def compute_stability(monitor: MonitorState) -> float:
     return stability
 
 
+# Indexed by (expected_change, actual_change) as a 2-bit number
+_CLASSIFICATION_TABLE = ("TN", "FP", "FN", "TP")
+
+
 def classify_observation(expected_change: bool, actual_change: bool) -> str:
     """Classify a single observation into TP, TN, FP, or FN.
 
@@ -142,11 +132,4 @@ def classify_observation(expected_change: bool, actual_change: bool) -> str:
     Returns:
         One of "TP", "TN", "FP", or "FN".
     """
-    if expected_change and actual_change:
-        return "TP"
-    elif not expected_change and not actual_change:
-        return "TN"
-    elif not expected_change and actual_change:
-        return "FP"
-    else:  # expected_change and not actual_change
-        return "FN"
+    return _CLASSIFICATION_TABLE[2 * bool(expected_change) + bool(actual_change)]
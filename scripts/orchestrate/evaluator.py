@@ -7,9 +7,10 @@ updates monitor confusion matrix and tracking statistics.
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
+from typing import Dict, Optional
 
 from .config import IntentDefinition, MutationStep
+from .efficacy import classify_observation
 from .state import Evaluation, MonitorState, Observation
 
 logger = logging.getLogger(__name__)
@@ -20,11 +21,24 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
+# Whether the agent should notify, by classification:
+#   TP -- a real change was detected, so notify
+#   TN -- nothing changed, so stay quiet
+#   FP -- a change was detected that shouldn't have been; correct to suppress
+#   FN -- the change was missed, the agent never saw it; not applicable
+_EXPECTED_AGENT_NOTIFY: Dict[str, Optional[bool]] = {
+    "TP": True,
+    "TN": False,
+    "FP": False,
+    "FN": None,
+}
+
+
 def evaluate_e2e(
     monitor: MonitorState,
     observation: Observation,
     intent: IntentDefinition,
-    applied_mutations: List[MutationStep],
+    last_trigger: Optional[MutationStep],
 ) -> Evaluation:
     """Deterministic E2E evaluation.
 
@@ -35,7 +49,8 @@ def evaluate_e2e(
         monitor: Current monitor state (includes cycle_count).
         observation: The observation from this check cycle.
         intent: The intent definition (includes mutation schedule).
-        applied_mutations: Mutations that have been applied so far.
+        last_trigger: The most recently applied mutation with
+            expect_detection=True, or None if none has been applied yet.
 
     Returns:
         Evaluation with classification (TP/TN/FP/FN) and agent correctness.
@@ -45,18 +60,13 @@ def evaluate_e2e(
     # -------------------------------------------------------------------------
     # a. Determine if a change-triggering mutation was applied before this cycle
     # -------------------------------------------------------------------------
-    # Find mutations with expect_detection=True that were applied at or before
-    # the current cycle. We consider a change "expected" if the most recent
-    # such mutation was applied in the previous cycle or this cycle (i.e., it's
-    # fresh enough that kto should detect it now).
+    # We consider a change "expected" if the most recent mutation with
+    # expect_detection=True was applied in the previous cycle or this cycle
+    # (i.e., it's fresh enough that kto should detect it now).
     expected_change = False
-    triggering_mutations = [
-        m for m in applied_mutations
-        if m.expect_detection and m.cycle <= current_cycle
-    ]
+    most_recent = last_trigger
 
-    if triggering_mutations:
-        most_recent = max(triggering_mutations, key=lambda m: m.cycle)
+    if most_recent is not None:
         # Expected if the mutation was applied this cycle or the previous one.
         # Beyond that, kto should have already detected it.
         if most_recent.cycle >= current_cycle - 1:
@@ -70,14 +80,7 @@ def evaluate_e2e(
     # -------------------------------------------------------------------------
     # c. Classify: TP, TN, FP, FN
     # -------------------------------------------------------------------------
-    if expected_change and actual_change:
-        classification = "TP"
-    elif not expected_change and not actual_change:
-        classification = "TN"
-    elif not expected_change and actual_change:
-        classification = "FP"
-    else:  # expected_change and not actual_change
-        classification = "FN"
+    classification = classify_observation(expected_change, actual_change)
 
     # -------------------------------------------------------------------------
     # d. Determine agent_correct
@@ -85,20 +88,9 @@ def evaluate_e2e(
     agent_correct: Optional[bool] = None
 
     if observation.agent_notified is not None:
-        if classification == "TP":
-            # Agent should notify on true positives
-            agent_correct = observation.agent_notified is True
-        elif classification == "TN":
-            # Agent should NOT notify when nothing changed
-            agent_correct = observation.agent_notified is False
-        elif classification == "FP":
-            # Change was detected but shouldn't have been.
-            # Agent is correct if it suppressed the false change.
-            agent_correct = observation.agent_notified is False
-        elif classification == "FN":
-            # Change was missed entirely, agent wasn't called with a change.
-            # Not applicable -- leave as None.
-            agent_correct = None
+        expected_notify = _EXPECTED_AGENT_NOTIFY[classification]
+        if expected_notify is not None:
+            agent_correct = observation.agent_notified is expected_notify
 
     # -------------------------------------------------------------------------
     # e. Build reason string
@@ -106,8 +98,7 @@ def evaluate_e2e(
     reason_parts = []
 
     if expected_change:
-        if triggering_mutations:
-            most_recent = max(triggering_mutations, key=lambda m: m.cycle)
+        if most_recent is not None:
             reason_parts.append(
                 f"Mutation '{most_recent.description or most_recent.field}' "
                 f"applied at cycle {most_recent.cycle}"
@@ -207,6 +198,10 @@ def evaluate_live(
 # =============================================================================
 
 
+# MonitorState confusion-matrix counter for each classification
+_CONFUSION_ATTR: Dict[str, str] = {"TP": "tp", "TN": "tn", "FP": "fp", "FN": "fn"}
+
+
 def update_monitor_stats(
     monitor: MonitorState,
     evaluation: Evaluation,
@@ -219,15 +214,13 @@ def update_monitor_stats(
         evaluation: The evaluation for this cycle.
         score: The computed efficacy score for this cycle.
     """
+    classification = evaluation.classification
+
     # Increment confusion matrix
-    if evaluation.classification == "TP":
-        monitor.tp += 1
-    elif evaluation.classification == "TN":
-        monitor.tn += 1
-    elif evaluation.classification == "FP":
-        monitor.fp += 1
-    elif evaluation.classification == "FN":
-        monitor.fn += 1
+    attr = _CONFUSION_ATTR.get(classification)
+    if attr is not None:
+        setattr(monitor, attr, getattr(monitor, attr) + 1)
+    monitor.refresh_rates()
 
     # Track agent decision accuracy
     if evaluation.agent_correct is not None:
@@ -235,25 +228,14 @@ def update_monitor_stats(
         if evaluation.agent_correct:
             monitor.agent_correct_decisions += 1
 
-    # Append score
+    # Append score (bounded deque evicts the oldest)
     monitor.scores.append(score)
 
     # Track detection latency for TPs
-    if evaluation.classification == "TP":
+    if classification == "TP":
         latency = compute_detection_latency(monitor, evaluation)
         if latency is not None:
-            monitor.detection_latencies.append(latency)
-
-    # Cap lists at 100 entries (evict oldest)
-    if len(monitor.observations) > 100:
-        monitor.observations = monitor.observations[-100:]
-    if len(monitor.evaluations) > 100:
-        monitor.evaluations = monitor.evaluations[-100:]
-    if len(monitor.scores) > 100:
-        monitor.scores = monitor.scores[-100:]
-    # detection_latencies capped at 50 (per state.py serialization)
-    if len(monitor.detection_latencies) > 50:
-        monitor.detection_latencies = monitor.detection_latencies[-50:]
+            monitor.record_detection_latency(latency)
 
 
 # =============================================================================
@@ -284,19 +266,12 @@ def compute_detection_latency(
 
     current_cycle = monitor.cycle_count
 
-    # Walk evaluations backwards to find the most recent TN
-    for prev_eval in reversed(monitor.evaluations):
-        if prev_eval.classification == "TN":
-            # Find the observation that corresponds to this evaluation
-            # The evaluations list is parallel to observations, so
-            # we use the index to find the cycle number.
-            idx = None
-            for i, e in enumerate(monitor.evaluations):
-                if e is prev_eval:
-                    idx = i
-                    break
-
-            if idx is not None and idx < len(monitor.observations):
+    # Walk evaluations backwards to find the most recent TN.  The evaluations
+    # deque is parallel to observations, so the same index gives the cycle.
+    evaluations = monitor.evaluations
+    for idx in range(len(evaluations) - 1, -1, -1):
+        if evaluations[idx].classification == "TN":
+            if idx < len(monitor.observations):
                 tn_cycle = monitor.observations[idx].cycle
                 latency = current_cycle - tn_cycle
                 if latency >= 0:
@@ -6,10 +6,12 @@ observation recording, and statistical conclusion to produce CreationRules.
 
 from __future__ import annotations
 
+import bisect
 import logging
 import random
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from .config import (
@@ -26,28 +28,34 @@ from .state import Experiment, ExperimentBlock
 
 logger = logging.getLogger(__name__)
 
+# Experiment statuses after which an experiment no longer records cycles
+TERMINAL_STATUSES = frozenset(("concluded", "insufficient_data"))
+
 
 # =============================================================================
 # Helper: derive intent_type and domain_class from monitor_name
 # =============================================================================
 
+_KNOWN_INTENTS = frozenset({"price", "stock", "release", "news", "generic"})
+
+
+@lru_cache(maxsize=512)
 def _parse_monitor_name(monitor_name: str) -> tuple:
     """Extract intent_type and domain_class from a monitor name.
 
     Convention: monitor names follow the pattern "intent-domain-..." or
     "intent_domain_...". Falls back to ("generic", None) if unparseable.
+    Pure in *monitor_name*, so results are memoized.
     """
     # Normalize separators
     normalized = monitor_name.replace("-", "_").lower()
     parts = normalized.split("_")
 
-    known_intents = {"price", "stock", "release", "news", "generic"}
-
     intent_type = "generic"
     domain_class = None
 
     if parts:
-        if parts[0] in known_intents:
+        if parts[0] in _KNOWN_INTENTS:
             intent_type = parts[0]
             if len(parts) > 1:
                 domain_class = parts[1]
@@ -78,23 +86,18 @@ def assign_blocks(
     if random.random() < 0.5:
         variants = list(reversed(variants))
 
-    blocks: List[ExperimentBlock] = []
-    cycle = 0
-    variant_idx = 0
-
-    while cycle < total_cycles:
-        start = cycle
-        end = min(cycle + block_size - 1, total_cycles - 1)
-        block = ExperimentBlock(
-            variant=variants[variant_idx % 2],
+    last_cycle = total_cycles - 1
+    blocks: List[ExperimentBlock] = [
+        ExperimentBlock(
+            variant=variants[i & 1],
             start_cycle=start,
-            end_cycle=end,
+            end_cycle=min(start + block_size - 1, last_cycle),
         )
-        blocks.append(block)
-        cycle = end + 1
-        variant_idx += 1
+        for i, start in enumerate(range(0, total_cycles, block_size))
+    ]
 
     experiment.blocks = blocks
+    experiment.refresh_blocks()
     logger.info(
         "Assigned %d blocks for experiment %s (%s vs %s), first variant: %s",
         len(blocks),
@@ -114,16 +117,31 @@ def get_current_block(
 ) -> Optional[ExperimentBlock]:
     """Find which block is active for the given cycle number.
 
-    Returns None if no block covers this cycle.
+    Cycles only move forward, so the block found last time (or the one
+    after it) is tried first. Otherwise, since blocks are contiguous and
+    ordered by start_cycle, the candidate is the last block starting at or
+    before *cycle*. Returns None if no block covers this cycle.
     """
-    for block in experiment.blocks:
-        if block.start_cycle <= cycle and (
-            block.end_cycle is None or cycle <= block.end_cycle
-        ):
-            return block
+    blocks = experiment.blocks
+    hint = experiment.last_block_idx
+    for idx in (hint, hint + 1):
+        if idx < len(blocks) and _block_covers(blocks[idx], cycle):
+            experiment.last_block_idx = idx
+            return blocks[idx]
+
+    idx = bisect.bisect_right(experiment.block_starts, cycle) - 1
+    if idx >= 0 and _block_covers(blocks[idx], cycle):
+        experiment.last_block_idx = idx
+        return blocks[idx]
     return None
 
 
+def _block_covers(block: ExperimentBlock, cycle: int) -> bool:
+    return block.start_cycle <= cycle and (
+        block.end_cycle is None or cycle <= block.end_cycle
+    )
+
+
 def get_current_variant(experiment: Experiment, cycle: int) -> Optional[str]:
     """Get the variant string for the given cycle.
 
@@ -159,13 +177,23 @@ def record_observation(
         )
         return
 
-    block.scores.append(score)
+    first_score = not block.scores
+    block.add_score(score)
 
-    if classification == "TP":
+    positive = classification == "TP"
+    if positive:
         block.positive_events += 1
     elif classification == "TN":
         block.negative_events += 1
 
+    # Keep the experiment's per-variant tallies in step with the block
+    if block.variant == experiment.variant_a:
+        experiment.positive_events_a += positive
+        experiment.scored_blocks_a += first_score
+    if block.variant == experiment.variant_b:
+        experiment.positive_events_b += positive
+        experiment.scored_blocks_b += first_score
+
     logger.debug(
         "Recorded observation for experiment %s cycle %d: score=%.3f class=%s variant=%s",
         experiment.id,
@@ -180,25 +208,23 @@ def record_observation(
 # Experiment Conclusion
 # =============================================================================
 
+def _mean_block_score(blocks: List[ExperimentBlock]) -> float:
+    """Mean of every score in *blocks*, from the per-block running totals."""
+    count = sum(len(b.scores) for b in blocks)
+    if count == 0:
+        return 0.0
+    return sum(b.score_sum for b in blocks) / count
+
+
 def conclude_experiment(experiment: Experiment) -> Optional[CreationRule]:
     """Try to conclude the experiment.
 
     Returns a :class:`CreationRule` if a winner is found, or None if the
     experiment cannot yet be concluded or shows no meaningful difference.
     """
-    # Partition blocks by variant (only those with scores)
-    blocks_a = [
-        b for b in experiment.blocks
-        if b.variant == experiment.variant_a and len(b.scores) > 0
-    ]
-    blocks_b = [
-        b for b in experiment.blocks
-        if b.variant == experiment.variant_b and len(b.scores) > 0
-    ]
-
-    # Count total positive events per variant
-    pos_a = sum(b.positive_events for b in blocks_a)
-    pos_b = sum(b.positive_events for b in blocks_b)
+    # Positive events per variant (running tallies, see record_observation)
+    pos_a = experiment.positive_events_a
+    pos_b = experiment.positive_events_b
 
     # Check minimum positive events per variant
     if pos_a < MIN_POSITIVE_EVENTS_PER_VARIANT or pos_b < MIN_POSITIVE_EVENTS_PER_VARIANT:
@@ -213,23 +239,36 @@ def conclude_experiment(experiment: Experiment) -> Optional[CreationRule]:
         return None
 
     # Check minimum blocks per variant
-    if len(blocks_a) < MIN_BLOCKS_PER_VARIANT or len(blocks_b) < MIN_BLOCKS_PER_VARIANT:
+    if (
+        experiment.scored_blocks_a < MIN_BLOCKS_PER_VARIANT
+        or experiment.scored_blocks_b < MIN_BLOCKS_PER_VARIANT
+    ):
         experiment.status = "insufficient_data"
         logger.info(
             "Experiment %s: insufficient blocks (A=%d, B=%d, need %d each)",
             experiment.id,
-            len(blocks_a),
-            len(blocks_b),
+            experiment.scored_blocks_a,
+            experiment.scored_blocks_b,
             MIN_BLOCKS_PER_VARIANT,
         )
         return None
 
-    # Compute mean score for each variant across all blocks
-    all_scores_a = [s for b in blocks_a for s in b.scores]
-    all_scores_b = [s for b in blocks_b for s in b.scores]
+    # Enough data: partition the scored blocks by variant, in one pass
+    variant_a = experiment.variant_a
+    variant_b = experiment.variant_b
+    blocks_a: List[ExperimentBlock] = []
+    blocks_b: List[ExperimentBlock] = []
+    for b in experiment.blocks:
+        if not b.scores:
+            continue
+        if b.variant == variant_a:
+            blocks_a.append(b)
+        if b.variant == variant_b:
+            blocks_b.append(b)
 
-    mean_a = sum(all_scores_a) / len(all_scores_a) if all_scores_a else 0.0
-    mean_b = sum(all_scores_b) / len(all_scores_b) if all_scores_b else 0.0
+    # Compute mean score for each variant across all blocks
+    mean_a = _mean_block_score(blocks_a)
+    mean_b = _mean_block_score(blocks_b)
 
     # Compute delta
     delta = abs(mean_a - mean_b)
@@ -359,7 +398,7 @@ def create_experiment(
 # =============================================================================
 
 # Fields to experiment on, in priority order
-_EXPERIMENT_FIELDS = ["extraction", "engine", "interval_secs", "instructions"]
+_EXPERIMENT_FIELDS = ("extraction", "engine", "interval_secs", "instructions")
 
 
 def plan_next_experiment(
@@ -374,12 +413,14 @@ def plan_next_experiment(
     Skips fields that already have concluded experiments.
     Returns None if all fields have been tested.
     """
-    # Collect fields already tested (any terminal status)
-    tested_fields = {
-        exp.field_name
-        for exp in completed_experiments
-        if exp.status in ("concluded", "insufficient_data")
-    }
+    # Collect fields already tested (any terminal status), stopping early
+    # once every field is covered
+    tested_fields = set()
+    for exp in completed_experiments:
+        if exp.status in TERMINAL_STATUSES:
+            tested_fields.add(exp.field_name)
+            if tested_fields.issuperset(_EXPERIMENT_FIELDS):
+                break
 
     for field_name in _EXPERIMENT_FIELDS:
         if field_name in tested_fields:
@@ -424,47 +465,40 @@ def plan_next_experiment(
     return None
 
 
+# Alternative tried for the current value (anything else falls back to the default)
+_EXTRACTION_SWAP = {"auto": "selector", "selector": "auto"}
+_ENGINE_SWAP = {"http": "playwright", "playwright": "http"}
+
+
+def _variant_interval(current_value, intent_type: str) -> Optional[str]:
+    """Halve the interval for time-sensitive intents, double it otherwise."""
+    try:
+        current_int = int(current_value)
+    except (ValueError, TypeError):
+        return None
+    if intent_type in ("price", "stock"):
+        # Try halving (faster checks), floored at 1 minute
+        return str(max(current_int // 2, 60))
+    # Try doubling (slower checks to reduce load)
+    return str(current_int * 2)
+
+
+# field_name -> (current_value, intent_type) -> variant B, or None if there is
+# no generic alternative
+_VARIANT_GENERATORS = {
+    "extraction": lambda current, _: _EXTRACTION_SWAP.get(str(current), "auto"),
+    "engine": lambda current, _: _ENGINE_SWAP.get(str(current), "http"),
+    "interval_secs": _variant_interval,
+    # Instructions experiments are context-dependent; no generic alternative
+    "instructions": lambda current, _: None,
+}
+
+
 def _generate_variant_b(
     field_name: str, current_value, intent_type: str
 ) -> Optional[str]:
     """Generate an alternative variant for a given field and intent type."""
-    if field_name == "extraction":
-        current = str(current_value)
-        if current == "auto":
-            return "selector"
-        elif current == "selector":
-            return "auto"
-        else:
-            return "auto"
-
-    elif field_name == "engine":
-        current = str(current_value)
-        if current == "http":
-            return "playwright"
-        elif current == "playwright":
-            return "http"
-        else:
-            return "http"
-
-    elif field_name == "interval_secs":
-        try:
-            current_int = int(current_value)
-        except (ValueError, TypeError):
-            return None
-        # For time-sensitive intents, try faster; otherwise try slower
-        if intent_type in ("price", "stock"):
-            # Try halving (faster checks)
-            variant = current_int // 2
-            if variant < 60:
-                variant = 60  # floor at 1 minute
-            return str(variant)
-        else:
-            # Try doubling (slower checks to reduce load)
-            variant = current_int * 2
-            return str(variant)
-
-    elif field_name == "instructions":
-        # Instructions experiments are context-dependent; no generic alternative
+    generator = _VARIANT_GENERATORS.get(field_name)
+    if generator is None:
         return None
-
-    return None
+    return generator(current_value, intent_type)
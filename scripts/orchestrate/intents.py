@@ -7,10 +7,17 @@ backport, or a minimal built-in TOML parser as a last resort.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import hashlib
+import logging
+import os
+import pickle
+import re
+from typing import Any, Dict, List, Optional
 
 from .config import IntentDefinition, MutationStep
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # TOML parsing — prefer stdlib tomllib, fall back to tomli, then built-in
@@ -41,6 +48,13 @@ except ModuleNotFoundError:
 # Minimal TOML parser (fallback for environments without tomllib/tomli)
 # ---------------------------------------------------------------------------
 
+_INT_RE = re.compile(r"[+-]?\d[\d_]*\Z")
+_FLOAT_RE = re.compile(
+    r"[+-]?(?:(?:\d[\d_]*)?\.?\d[\d_]*(?:[eE][+-]?\d[\d_]*)?|inf|nan)\Z"
+)
+_INLINE_ARRAY_SPLIT = re.compile(r"\s*,\s*")
+
+
 def _minimal_toml_parse(text: str) -> dict:
     """Parse the subset of TOML used by intent definition files.
 
@@ -55,57 +69,61 @@ def _minimal_toml_parse(text: str) -> dict:
     """
     root: Dict[str, Any] = {}
     current: Dict[str, Any] = root
-    current_path: List[str] = []
-    array_tables: Dict[str, list] = {}
+    # Dotted header path -> resolved table, so repeated headers under the
+    # same parent (e.g. several [[intents.mutations]]) skip the walk from
+    # root. Entries under an array of tables go stale when it gets a new
+    # element and are dropped then.
+    resolved: Dict[str, Dict[str, Any]] = {}
     lines = text.splitlines()
     idx = 0
 
-    def _set_nested(d: dict, keys: List[str], value: Any) -> None:
-        for k in keys[:-1]:
-            d = d.setdefault(k, {})
-        d[keys[-1]] = value
+    def _get_nested(keys: List[str]) -> dict:
+        """Return the table at *keys*, creating missing tables.
 
-    def _get_nested(d: dict, keys: List[str]) -> dict:
-        for k in keys:
-            d = d.setdefault(k, {})
-        return d
+        An array of tables along the path resolves to its last element, so
+        [[intents.mutations]] nests under the most recent [[intents]].
+        """
+        path_key = ".".join(keys)
+        table = resolved.get(path_key)
+        if table is None:
+            table = root
+            for k in keys:
+                table = table.setdefault(k, {})
+                if isinstance(table, list):
+                    table = table[-1]
+            resolved[path_key] = table
+        return table
 
     def _parse_value(raw: str) -> Any:
         raw = raw.strip()
         if not raw:
             return ""
+        first = raw[0]
+        # Quoted string (the common case, checked first)
+        if first in "\"'" and len(raw) > 1 and raw[-1] == first:
+            return raw[1:-1]
         # Boolean
         if raw == "true":
             return True
         if raw == "false":
             return False
-        # Integer
-        try:
+        # Numbers: classify by pattern instead of trying int() then float()
+        if _INT_RE.match(raw):
             return int(raw)
-        except ValueError:
-            pass
-        # Float
-        try:
+        if _FLOAT_RE.match(raw):
             return float(raw)
-        except ValueError:
-            pass
-        # Quoted string
-        if (raw.startswith('"') and raw.endswith('"')) or (
-            raw.startswith("'") and raw.endswith("'")
-        ):
-            return raw[1:-1]
         # Inline array
-        if raw.startswith("[") and raw.endswith("]"):
+        if first == "[" and raw.endswith("]"):
             inner = raw[1:-1].strip()
             if not inner:
                 return []
-            items = []
-            for item in inner.split(","):
-                item = item.strip()
-                if not item:
-                    continue
-                items.append(_parse_value(item))
-            return items
+            # The split swallows whitespace around commas, so items arrive
+            # stripped; empty ones (e.g. a trailing comma) are skipped
+            return [
+                _parse_value(item)
+                for item in _INLINE_ARRAY_SPLIT.split(inner)
+                if item
+            ]
         # Bare string (shouldn't happen in valid TOML, but be lenient)
         return raw
 
@@ -157,19 +175,16 @@ def _minimal_toml_parse(text: str) -> dict:
             parts = [p.strip() for p in path_str.split(".")]
             table_key = ".".join(parts)
 
-            if table_key not in array_tables:
-                array_tables[table_key] = []
-                # Ensure parent path exists and set the array
-                if len(parts) > 1:
-                    parent = _get_nested(root, parts[:-1])
-                    parent[parts[-1]] = array_tables[table_key]
-                else:
-                    root[parts[0]] = array_tables[table_key]
-
+            parent = _get_nested(parts[:-1])
             new_table: Dict[str, Any] = {}
-            array_tables[table_key].append(new_table)
+            parent.setdefault(parts[-1], []).append(new_table)
+
+            # Paths through this array now resolve to the new element
+            prefix = table_key + "."
+            for key in [k for k in resolved if k == table_key or k.startswith(prefix)]:
+                del resolved[key]
+
             current = new_table
-            current_path = parts
             idx += 1
             continue
 
@@ -182,16 +197,15 @@ def _minimal_toml_parse(text: str) -> dict:
             # e.g., [[intents]] then [[intents.mutations]] means mutations
             # is an array of tables under the last intents entry.
             # But for [intents.mutations], it's a regular table.
-            current = _get_nested(root, parts)
-            current_path = parts
+            current = _get_nested(parts)
             idx += 1
             continue
 
         # Key = Value
-        if "=" in stripped:
-            eq_pos = stripped.index("=")
-            key = stripped[:eq_pos].strip()
-            val_raw = stripped[eq_pos + 1:].strip()
+        key, sep, val_raw = stripped.partition("=")
+        if sep:
+            key = key.strip()
+            val_raw = val_raw.strip()
 
             # Strip inline comments (not inside strings)
             if val_raw and not val_raw.startswith('"') and not val_raw.startswith("'"):
@@ -218,15 +232,62 @@ if _toml_loads is None:
     _toml_loads = _minimal_toml_parse
 
 
+# ---------------------------------------------------------------------------
+# Parsed-intents cache (keyed by file path + content hash)
+# ---------------------------------------------------------------------------
+
+_INTENTS_CACHE_FILE = ".intents_cache.pkl"
+
+# Bump when IntentDefinition/MutationStep change shape so stale pickles miss
+_INTENTS_CACHE_VERSION = 2
+
+
+def _cache_key(path: str, text: str) -> tuple:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return (_INTENTS_CACHE_VERSION, os.path.abspath(path), digest)
+
+
+def _read_intents_cache(cache_dir: str, key: tuple) -> Optional[List[IntentDefinition]]:
+    """Return cached intents for *key*, or None on miss or unreadable cache."""
+    cache_path = os.path.join(cache_dir, _INTENTS_CACHE_FILE)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, intents = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("Ignoring unreadable intents cache %s: %s", cache_path, exc)
+        return None
+    if cached_key != key:
+        return None
+    return intents
+
+
+def _write_intents_cache(
+    cache_dir: str, key: tuple, intents: List[IntentDefinition]
+) -> None:
+    """Persist parsed intents atomically; failures are non-fatal."""
+    cache_path = os.path.join(cache_dir, _INTENTS_CACHE_FILE)
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, intents), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.debug("Failed to write intents cache %s: %s", cache_path, exc)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def load_intents(path: str) -> List[IntentDefinition]:
+def load_intents(path: str, cache_dir: Optional[str] = None) -> List[IntentDefinition]:
     """Load intent definitions from a TOML file.
 
     Args:
         path: Filesystem path to the TOML intent definitions file.
+        cache_dir: If set, parsed intents are cached in this directory and
+            reused while the file content is unchanged (e.g. on --resume).
 
     Returns:
         A list of IntentDefinition objects parsed from the file.
@@ -238,6 +299,14 @@ def load_intents(path: str) -> List[IntentDefinition]:
     with open(path, "r", encoding="utf-8") as f:
         text = f.read()
 
+    key = None
+    if cache_dir:
+        key = _cache_key(path, text)
+        cached = _read_intents_cache(cache_dir, key)
+        if cached is not None:
+            logger.debug("Loaded %d intent(s) from cache for %s", len(cached), path)
+            return cached
+
     try:
         data = _toml_loads(text)
     except Exception as exc:
@@ -264,9 +333,21 @@ def load_intents(path: str) -> List[IntentDefinition]:
             raw["mode"] = default_mode
         result.append(IntentDefinition.from_dict(raw))
 
+    if cache_dir:
+        _write_intents_cache(cache_dir, key, result)
+
     return result
 
 
+# Run modes understood by the cycle runner and efficacy scoring
+_VALID_MODES = frozenset(("e2e", "live"))
+
+
+def _intent_label(index: int, intent: IntentDefinition) -> str:
+    """Name an intent in validation messages (built only when one is needed)."""
+    return f"intent '{intent.name}'" if intent.name else f"intent[{index}]"
+
+
 def validate_intents(intents: List[IntentDefinition]) -> List[str]:
     """Validate a list of intent definitions.
 
@@ -278,39 +359,49 @@ def validate_intents(intents: List[IntentDefinition]) -> List[str]:
       - E2E intents (mode == "e2e") should have at least one mutation.
       - Mutation cycles must be positive integers.
       - expected_detections should not be negative.
+      - mode must be "e2e" or "live".
       - Intent names must be unique.
     """
     errors: List[str] = []
     seen_names: set = set()
 
     for i, intent in enumerate(intents):
-        prefix = f"intent[{i}]"
-        if intent.name:
-            prefix = f"intent '{intent.name}'"
-
         # Required fields
         if not intent.name:
-            errors.append(f"{prefix}: missing required field 'name'")
+            errors.append(f"{_intent_label(i, intent)}: missing required field 'name'")
         if not intent.url:
-            errors.append(f"{prefix}: missing required field 'url'")
+            errors.append(f"{_intent_label(i, intent)}: missing required field 'url'")
         if not intent.intent_type:
-            errors.append(f"{prefix}: missing required field 'intent_type'")
+            errors.append(
+                f"{_intent_label(i, intent)}: missing required field 'intent_type'"
+            )
 
         # Duplicate names
         if intent.name:
             if intent.name in seen_names:
-                errors.append(f"{prefix}: duplicate intent name '{intent.name}'")
+                errors.append(
+                    f"{_intent_label(i, intent)}: duplicate intent name '{intent.name}'"
+                )
             seen_names.add(intent.name)
 
+        if intent.mode not in _VALID_MODES:
+            errors.append(
+                f"{_intent_label(i, intent)}: mode must be one of "
+                f"{sorted(_VALID_MODES)}, got '{intent.mode}'"
+            )
+
         # E2E intents should have mutations
         if intent.mode == "e2e" and not intent.mutations:
             errors.append(
-                f"{prefix}: E2E intent should have at least one mutation defined"
+                f"{_intent_label(i, intent)}: E2E intent should have at least "
+                f"one mutation defined"
             )
 
-        # Validate mutations
+        # Validate mutations (the prefix is only formatted for a bad one)
         for j, mut in enumerate(intent.mutations):
-            mut_prefix = f"{prefix} mutation[{j}]"
+            if mut.cycle > 0 and mut.field:
+                continue
+            mut_prefix = f"{_intent_label(i, intent)} mutation[{j}]"
 
             if mut.cycle <= 0:
                 errors.append(
@@ -323,8 +414,8 @@ def validate_intents(intents: List[IntentDefinition]) -> List[str]:
         # expected_detections should be non-negative
         if intent.expected_detections < 0:
             errors.append(
-                f"{prefix}: expected_detections must be non-negative, "
-                f"got {intent.expected_detections}"
+                f"{_intent_label(i, intent)}: expected_detections must be "
+                f"non-negative, got {intent.expected_detections}"
             )
 
     return errors
@@ -0,0 +1,51 @@
+"""JSON encoding/decoding with an optional orjson fast path.
+
+Prefers orjson when it is installed and falls back to the stdlib json
+module otherwise, so the orchestrator keeps running on a bare Python.
+Encoding always returns UTF-8 bytes, ready for a single binary write.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ModuleNotFoundError:
+    orjson = None
+
+
+def dumps(
+    obj: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Serialize *obj* to JSON bytes.
+
+    Args:
+        obj: JSON-compatible object (dicts, lists, scalars).
+        indent: Pretty-print with two-space indentation.
+        default: Fallback converter for otherwise unserializable values.
+
+    Returns:
+        The UTF-8 encoded JSON document (no trailing newline).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=default).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from ``str`` or ``bytes``.
+
+    Raises:
+        json.JSONDecodeError: On malformed input (orjson's decode error
+            subclasses it, so callers can catch the stdlib type).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -10,10 +10,10 @@ from __future__ import annotations
 import json
 import logging
 import os
-import uuid
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from . import jsonio
 from .config import (
     KNOWLEDGE_SCHEMA_VERSION,
     PRECEDENCE_ORDER,
@@ -23,9 +23,27 @@ from .config import (
     CreationRule,
     CreationRecommendation,
 )
+from .state import fsync_dir
 
 logger = logging.getLogger(__name__)
 
+# Outcomes of KnowledgeBase.load()
+LOAD_LOADED = "loaded"
+LOAD_MISSING = "missing"
+LOAD_CORRUPT = "corrupt"
+
+# Decay rate for rule types missing from DECAY_RATES
+_DEFAULT_DECAY_RATE = DECAY_RATES.get("heuristic", 0.02)
+
+# CreationRecommendation fields merged by get_recommendation()
+_RECOMMENDATION_FIELDS = (
+    "engine",
+    "extraction",
+    "interval_secs",
+    "instruction_template",
+    "selector",
+)
+
 
 class KnowledgeBase:
     """Persistent store of learned creation rules with versioning and decay.
@@ -46,24 +64,40 @@ class KnowledgeBase:
         self.path: str = path
         self.rules: List[CreationRule] = []
         self.schema_version: int = KNOWLEDGE_SCHEMA_VERSION
-
-    def load(self) -> bool:
+        # Lookups over self.rules, rebuilt by _reindex() whenever the list is
+        # replaced:
+        #   _index     -- (intent_type, domain_class, rule text) -> position,
+        #                 so add_rule finds an existing rule without scanning
+        #   _by_intent -- intent_type -> its rules, in self.rules order
+        self._index: Dict[Tuple[str, Optional[str], str], int] = {}
+        self._by_intent: Dict[str, List[CreationRule]] = {}
+
+    def load(self) -> str:
         """Load knowledge base from disk.
 
+        Absence is detected by the open itself rather than a prior
+        existence check, so there is no window between check and read.
+
         Returns:
-            True if loaded successfully, False if file doesn't exist or has
-            an unknown schema_version (safe fallback).
+            LOAD_LOADED on success, LOAD_MISSING if the file doesn't exist,
+            LOAD_CORRUPT if it is unreadable, malformed, or has an unknown
+            schema_version (safe fallback).
         """
-        if not os.path.exists(self.path):
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
             logger.debug("Knowledge file does not exist: %s", self.path)
-            return False
+            return LOAD_MISSING
+        except OSError as exc:
+            logger.warning("Failed to read knowledge file %s: %s", self.path, exc)
+            return LOAD_CORRUPT
 
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, OSError) as exc:
+            data = jsonio.loads(raw)
+        except json.JSONDecodeError as exc:
             logger.warning("Failed to read knowledge file %s: %s", self.path, exc)
-            return False
+            return LOAD_CORRUPT
 
         file_version = data.get("schema_version", 0)
         if file_version != KNOWLEDGE_SCHEMA_VERSION:
@@ -73,15 +107,22 @@ class KnowledgeBase:
                 file_version,
                 KNOWLEDGE_SCHEMA_VERSION,
             )
-            return False
+            return LOAD_CORRUPT
 
         self.schema_version = file_version
         self.rules = [CreationRule.from_dict(r) for r in data.get("rules", [])]
+        self._reindex()
         logger.info("Loaded %d rules from %s", len(self.rules), self.path)
-        return True
+        return LOAD_LOADED
 
-    def save(self) -> None:
-        """Atomic write: write to .tmp then os.replace to final path."""
+    def save(self, durable: bool = False) -> None:
+        """Compact decayed rules, then write atomically (.tmp + os.replace).
+
+        With ``durable=True`` the data and the parent directory entry are
+        also fsynced, as for :func:`~.state.save_state_atomic`; use it for
+        the final save of a run.
+        """
+        self.apply_decay()
         data = {
             "schema_version": self.schema_version,
             "rules": [r.to_dict() for r in self.rules],
@@ -94,10 +135,15 @@ class KnowledgeBase:
 
         tmp_path = self.path + ".tmp"
         try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-                f.write("\n")
+            payload = jsonio.dumps(data, indent=True) + b"\n"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
             os.replace(tmp_path, self.path)
+            if durable:
+                fsync_dir(dir_path or ".")
             logger.debug("Saved %d rules to %s", len(self.rules), self.path)
         except OSError as exc:
             logger.error("Failed to save knowledge file %s: %s", self.path, exc)
@@ -113,12 +159,10 @@ class KnowledgeBase:
         """Add or update a rule.
 
         If a rule with the same intent_type + domain_class + rule text already
-        exists, update it only if the new confidence is higher. Generates a
-        rule ID if the incoming rule has an empty id.
+        exists, update it only if the new confidence is higher (keeping the
+        existing rule's id). Generates a rule ID if a newly inserted rule
+        has an empty id.
         """
-        if not rule.id:
-            rule.id = str(uuid.uuid4())
-
         if not rule.created_at:
             rule.created_at = datetime.now(timezone.utc).isoformat()
 
@@ -126,33 +170,41 @@ class KnowledgeBase:
             rule.last_validated = rule.created_at
 
         # Look for existing rule with same key triple
-        for i, existing in enumerate(self.rules):
-            if (
-                existing.intent_type == rule.intent_type
-                and existing.domain_class == rule.domain_class
-                and existing.rule == rule.rule
-            ):
-                if rule.confidence > existing.confidence:
-                    # Preserve the original ID and created_at
-                    rule.id = existing.id
-                    rule.created_at = existing.created_at
-                    self.rules[i] = rule
-                    logger.debug(
-                        "Updated rule %s: confidence %.2f -> %.2f",
-                        rule.id,
-                        existing.confidence,
-                        rule.confidence,
-                    )
-                else:
-                    logger.debug(
-                        "Skipped rule update %s: existing confidence %.2f >= new %.2f",
-                        existing.id,
-                        existing.confidence,
-                        rule.confidence,
-                    )
-                return
+        key = (rule.intent_type, rule.domain_class, rule.rule)
+        i = self._index.get(key)
+        if i is not None:
+            existing = self.rules[i]
+            if self.effective_confidence(rule) > self.effective_confidence(existing):
+                # Preserve the original ID and created_at
+                rule.id = existing.id
+                rule.created_at = existing.created_at
+                self.rules[i] = rule
+                bucket = self._by_intent[rule.intent_type]
+                for j, r in enumerate(bucket):
+                    if r is existing:
+                        bucket[j] = rule
+                        break
+                logger.debug(
+                    "Updated rule %s: confidence %.2f -> %.2f",
+                    rule.id,
+                    existing.confidence,
+                    rule.confidence,
+                )
+            else:
+                logger.debug(
+                    "Skipped rule update %s: existing confidence %.2f >= new %.2f",
+                    existing.id,
+                    existing.confidence,
+                    rule.confidence,
+                )
+            return
 
+        # Only a genuinely new rule needs an id; updates reuse the existing one
+        if not rule.id:
+            rule.id = _new_rule_id()
+        self._index[key] = len(self.rules)
         self.rules.append(rule)
+        self._by_intent.setdefault(rule.intent_type, []).append(rule)
         logger.debug("Added new rule %s (intent=%s, domain=%s)", rule.id, rule.intent_type, rule.domain_class)
 
     def get_rules(
@@ -170,31 +222,7 @@ class KnowledgeBase:
             List of matching rules sorted by scope precedence (intent+domain
             first, then intent-only) then by confidence descending.
         """
-        matched: List[CreationRule] = []
-
-        for rule in self.rules:
-            if rule.intent_type != intent_type:
-                continue
-
-            if domain_class is not None:
-                # Match rules with same domain_class OR no domain_class
-                if rule.domain_class is not None and rule.domain_class != domain_class:
-                    continue
-            else:
-                # Only match rules with no domain_class
-                if rule.domain_class is not None:
-                    continue
-
-            matched.append(rule)
-
-        # Sort: domain-scoped (intent+domain) first, then intent-only, then by confidence desc
-        def sort_key(r: CreationRule) -> tuple:
-            # Lower sort value = higher priority
-            has_domain = 0 if r.domain_class is not None else 1
-            return (has_domain, -r.confidence)
-
-        matched.sort(key=sort_key)
-        return matched
+        return [rule for rule, _ in self._ranked_rules(intent_type, domain_class)]
 
     def get_recommendation(
         self, intent_type: str, domain_class: Optional[str] = None
@@ -210,96 +238,87 @@ class KnowledgeBase:
         Returns:
             A merged CreationRecommendation, or None if no matching rules.
         """
-        rules = self.get_rules(intent_type, domain_class)
-        if not rules:
+        ranked = self._ranked_rules(intent_type, domain_class)
+        if not ranked:
             return None
 
-        # Merge: first rule to set a field wins (rules are sorted by precedence)
+        # Merge: first rule to set a field wins (rules are sorted by
+        # precedence); a later rule overrides it only with higher confidence
         rec = CreationRecommendation()
         field_sources: Dict[str, float] = {}  # field -> confidence of rule that set it
 
-        for rule in rules:
+        for rule, conf in ranked:
             r = rule.recommendation
-            if r.engine is not None and "engine" not in field_sources:
-                rec.engine = r.engine
-                field_sources["engine"] = rule.confidence
-            elif r.engine is not None and rule.confidence > field_sources.get("engine", 0.0):
-                rec.engine = r.engine
-                field_sources["engine"] = rule.confidence
-
-            if r.extraction is not None and "extraction" not in field_sources:
-                rec.extraction = r.extraction
-                field_sources["extraction"] = rule.confidence
-            elif r.extraction is not None and rule.confidence > field_sources.get("extraction", 0.0):
-                rec.extraction = r.extraction
-                field_sources["extraction"] = rule.confidence
-
-            if r.interval_secs is not None and "interval_secs" not in field_sources:
-                rec.interval_secs = r.interval_secs
-                field_sources["interval_secs"] = rule.confidence
-            elif r.interval_secs is not None and rule.confidence > field_sources.get("interval_secs", 0.0):
-                rec.interval_secs = r.interval_secs
-                field_sources["interval_secs"] = rule.confidence
-
-            if r.instruction_template is not None and "instruction_template" not in field_sources:
-                rec.instruction_template = r.instruction_template
-                field_sources["instruction_template"] = rule.confidence
-            elif r.instruction_template is not None and rule.confidence > field_sources.get("instruction_template", 0.0):
-                rec.instruction_template = r.instruction_template
-                field_sources["instruction_template"] = rule.confidence
-
-            if r.selector is not None and "selector" not in field_sources:
-                rec.selector = r.selector
-                field_sources["selector"] = rule.confidence
-            elif r.selector is not None and rule.confidence > field_sources.get("selector", 0.0):
-                rec.selector = r.selector
-                field_sources["selector"] = rule.confidence
+            for name in _RECOMMENDATION_FIELDS:
+                value = getattr(r, name)
+                if value is None:
+                    continue
+                if name not in field_sources or conf > field_sources[name]:
+                    setattr(rec, name, value)
+                    field_sources[name] = conf
+
+            # Once every field is set and we are among the intent-only rules,
+            # the rest have no higher confidence than this one, so none can
+            # displace a field already set at least this confidently
+            if (
+                rule.domain_class is None
+                and len(field_sources) == len(_RECOMMENDATION_FIELDS)
+                and min(field_sources.values()) >= conf
+            ):
+                break
 
         return rec
 
+    def effective_confidence(
+        self, rule: CreationRule, now: Optional[datetime] = None
+    ) -> float:
+        """Return the rule's confidence with pending decay applied.
+
+        Stored confidences are only decayed when the knowledge base is
+        compacted (see :meth:`apply_decay`); reads use this instead so the
+        value is always current without mutating the rule.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        return _decayed_confidence(rule, now.timestamp())
+
     def apply_decay(self) -> int:
-        """Apply time-based decay to all rules based on rule_type.
+        """Fold pending decay into stored confidences and drop decayed rules.
 
-        Reduces confidence by (days_since_last_validated * decay_rate).
-        Removes rules whose confidence drops below 0.1.
+        Confidence decays by (days since last decay * decay_rate), where the
+        decay anchor is ``last_decayed`` (or ``last_validated`` for rules
+        never decayed). The anchor moves to now, so repeated calls never
+        decay the same interval twice. Rules whose confidence drops below
+        0.1 are removed. Called by :meth:`save`.
 
         Returns:
             Number of rules removed due to decay.
         """
         now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        now_epoch = now.timestamp()
+        now_anchor = (now_iso, now_epoch)
         surviving: List[CreationRule] = []
         removed_count = 0
 
         for rule in self.rules:
-            if rule.last_validated:
-                try:
-                    last_validated = datetime.fromisoformat(rule.last_validated)
-                    # Ensure timezone-aware comparison
-                    if last_validated.tzinfo is None:
-                        last_validated = last_validated.replace(tzinfo=timezone.utc)
-                    days_elapsed = (now - last_validated).total_seconds() / 86400.0
-                except (ValueError, TypeError):
-                    days_elapsed = 0.0
-            else:
-                days_elapsed = 0.0
-
-            rate = DECAY_RATES.get(rule.rule_type, DECAY_RATES.get("heuristic", 0.02))
-            decay_amount = days_elapsed * rate
-            rule.confidence = max(0.0, rule.confidence - decay_amount)
+            rule.confidence = _decayed_confidence(rule, now_epoch)
+            rule.last_decayed = now_iso
+            rule._anchor = now_anchor
 
             if rule.confidence < 0.1:
                 logger.debug(
-                    "Removing decayed rule %s (confidence %.4f, type=%s, days=%.1f)",
+                    "Removing decayed rule %s (confidence %.4f, type=%s)",
                     rule.id,
                     rule.confidence,
                     rule.rule_type,
-                    days_elapsed,
                 )
                 removed_count += 1
             else:
                 surviving.append(rule)
 
         self.rules = surviving
+        self._reindex()
         if removed_count > 0:
             logger.info("Decay removed %d rules, %d remaining", removed_count, len(self.rules))
         return removed_count
@@ -341,7 +360,7 @@ class KnowledgeBase:
         # Create promoted rule
         now_iso = datetime.now(timezone.utc).isoformat()
         promoted = CreationRule(
-            id=str(uuid.uuid4()),
+            id=_new_rule_id(),
             intent_type=rule.intent_type,
             domain_class=None,
             scope="intent",
@@ -382,6 +401,32 @@ class KnowledgeBase:
             Dictionary with schema_version, precedence, rules, and summary
             statistics.
         """
+        return {
+            "schema_version": self.schema_version,
+            "precedence": PRECEDENCE_ORDER,
+            "rules": [r.to_dict() for r in self.rules],
+            "summary": self._summary(),
+        }
+
+    def export_summary(self) -> dict:
+        """Export only the summary statistics, without serializing rules.
+
+        Returns:
+            Dictionary with schema_version, precedence, and summary
+            statistics (the same ``summary`` as :meth:`export`).
+        """
+        return {
+            "schema_version": self.schema_version,
+            "precedence": PRECEDENCE_ORDER,
+            "summary": self._summary(),
+        }
+
+    def rule_count(self) -> int:
+        """Return the number of rules in the knowledge base."""
+        return len(self.rules)
+
+    def _summary(self) -> dict:
+        """Rule counts overall and by intent, rule type, and scope."""
         rules_by_intent: Dict[str, int] = {}
         rules_by_type: Dict[str, int] = {}
         rules_by_scope: Dict[str, int] = {}
@@ -393,17 +438,99 @@ class KnowledgeBase:
             rules_by_scope[scope] = rules_by_scope.get(scope, 0) + 1
 
         return {
-            "schema_version": self.schema_version,
-            "precedence": PRECEDENCE_ORDER,
-            "rules": [r.to_dict() for r in self.rules],
-            "summary": {
-                "total_rules": len(self.rules),
-                "by_intent": rules_by_intent,
-                "by_type": rules_by_type,
-                "by_scope": rules_by_scope,
-            },
+            "total_rules": len(self.rules),
+            "by_intent": rules_by_intent,
+            "by_type": rules_by_type,
+            "by_scope": rules_by_scope,
         }
 
-    def rule_count(self) -> int:
-        """Return the number of rules in the knowledge base."""
-        return len(self.rules)
+    def _ranked_rules(
+        self, intent_type: str, domain_class: Optional[str]
+    ) -> List[Tuple[CreationRule, float]]:
+        """Matching rules paired with their effective confidence, in
+        :meth:`get_rules` order."""
+        now_epoch = datetime.now(timezone.utc).timestamp()
+        matched: List[Tuple[CreationRule, float]] = []
+
+        for rule in self._by_intent.get(intent_type, ()):
+            if domain_class is not None:
+                # Match rules with same domain_class OR no domain_class
+                if rule.domain_class is not None and rule.domain_class != domain_class:
+                    continue
+            else:
+                # Only match rules with no domain_class
+                if rule.domain_class is not None:
+                    continue
+
+            # Rules decayed below the removal threshold are already dead
+            conf = _decayed_confidence(rule, now_epoch)
+            if conf < 0.1:
+                continue
+
+            matched.append((rule, conf))
+
+        # Sort: domain-scoped (intent+domain) first, then intent-only, then by confidence desc
+        def sort_key(item: Tuple[CreationRule, float]) -> tuple:
+            # Lower sort value = higher priority
+            rule, conf = item
+            has_domain = 0 if rule.domain_class is not None else 1
+            return (has_domain, -conf)
+
+        matched.sort(key=sort_key)
+        return matched
+
+    def _reindex(self) -> None:
+        """Rebuild the rule lookups after self.rules is replaced.
+
+        If the list holds duplicate keys, the first occurrence wins, as it
+        did for the linear scan.
+        """
+        self._index = {}
+        self._by_intent = {}
+        for i, rule in enumerate(self.rules):
+            self._index.setdefault((rule.intent_type, rule.domain_class, rule.rule), i)
+            self._by_intent.setdefault(rule.intent_type, []).append(rule)
+
+
+def _new_rule_id() -> str:
+    """A random 32-hex-digit rule id (the same shape as ``uuid4().hex``)."""
+    return os.urandom(16).hex()
+
+
+def _decayed_confidence(rule: CreationRule, now_epoch: float) -> float:
+    """The rule's confidence decayed from its anchor to *now_epoch*.
+
+    Shared by the per-rule and whole-base paths so callers scanning many
+    rules read the clock once instead of once per rule.
+    """
+    anchor = _anchor_epoch(rule)
+    if anchor is None or anchor >= now_epoch:
+        return max(0.0, rule.confidence)
+    rate = DECAY_RATES.get(rule.rule_type, _DEFAULT_DECAY_RATE)
+    return max(0.0, rule.confidence - (now_epoch - anchor) / 86400.0 * rate)
+
+
+def _anchor_epoch(rule: CreationRule) -> Optional[float]:
+    """The rule's decay anchor as a UNIX epoch; None if missing or unparseable.
+
+    The anchor is ``last_decayed`` (or ``last_validated`` for rules never
+    decayed). It is parsed once and cached on the rule until the anchor
+    string changes. Naive timestamps are treated as UTC.
+    """
+    iso_ts = rule.last_decayed or rule.last_validated
+    cached_ts, epoch = rule._anchor
+    if iso_ts == cached_ts:
+        return epoch
+
+    epoch = None
+    if iso_ts:
+        try:
+            ts = datetime.fromisoformat(iso_ts)
+        except (ValueError, TypeError):
+            pass
+        else:
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            epoch = ts.timestamp()
+    rule._anchor = (iso_ts, epoch)
+    return epoch
@@ -11,11 +11,11 @@ import json
 import logging
 import os
 import subprocess
-from datetime import datetime
 from typing import Dict, List, Optional
 
+from . import jsonio
 from .config import OrchestratorConfig
-from .state import Observation
+from .state import Observation, utc_iso_now
 
 logger = logging.getLogger(__name__)
 
@@ -56,8 +56,11 @@ class KtoClient:
 
         cmd = [self.config.kto_binary] + args
 
-        env = os.environ.copy()
+        # Only copy the environment when it needs changing; env=None
+        # inherits the parent's as-is
+        env: Optional[Dict[str, str]] = None
         if db_path:
+            env = os.environ.copy()
             env["KTO_DB"] = db_path
 
         logger.debug("Running: %s (timeout=%ds, db=%s)", " ".join(cmd), timeout, db_path)
@@ -187,7 +190,7 @@ class KtoClient:
         Returns:
             An Observation populated from the check result.
         """
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = utc_iso_now()
 
         try:
             result = self._run_kto(
@@ -217,7 +220,7 @@ class KtoClient:
 
         # Parse JSON output
         try:
-            data = json.loads(result.stdout)
+            data = jsonio.loads(result.stdout)
         except (json.JSONDecodeError, ValueError) as exc:
             logger.error(
                 "Failed to parse JSON from kto test %r: %s\nstdout: %s",
@@ -282,7 +285,7 @@ class KtoClient:
             return []
 
         try:
-            data = json.loads(result.stdout)
+            data = jsonio.loads(result.stdout)
             if isinstance(data, list):
                 return data
             # Some versions may wrap in an object
@@ -3,16 +3,32 @@
 Provides dual-output logging: a human-readable log file for quick
 inspection and a structured JSONL file for machine analysis. Both
 files support automatic rotation when they exceed a configurable
-size limit.
+size limit. Entries are buffered in memory and appended in batches
+through file handles that stay open between writes.
 """
 
 from __future__ import annotations
 
-import json
+import atexit
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from . import jsonio
+
+# Python logging level for each OrchestrationLogger level (console mirror)
+_PY_LEVELS: Dict[str, int] = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "learning": logging.INFO,
+}
+
+# Padded level tag for each line of the human-readable log
+_LEVEL_TAGS: Dict[str, str] = {level: level.upper().ljust(8) for level in _PY_LEVELS}
 
 
 class OrchestrationLogger:
@@ -24,14 +40,44 @@ class OrchestrationLogger:
 
     When either file exceeds *max_bytes*, it is rotated by renaming
     it to ``.1`` (any previous ``.1`` is overwritten).
+
+    File output is buffered: entries are written once *flush_bytes* are
+    pending, once *flush_interval_secs* have passed since the last write,
+    on every ``error``, and on :meth:`flush` / :meth:`close` (also run at
+    interpreter exit). Console output is never delayed.
+
+    Each file is opened once on first write and kept open (reopened after
+    a rotation) until :meth:`close`; the logger is also a context manager.
     """
 
     # Level names consistent with standard logging + custom "learning"
     LEVELS = ("debug", "info", "warn", "error", "learning")
 
-    def __init__(self, state_dir: str, max_bytes: int = 10 * 1024 * 1024) -> None:
+    def __init__(
+        self,
+        state_dir: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        flush_bytes: int = 64 * 1024,
+        flush_interval_secs: float = 1.0,
+    ) -> None:
         self._state_dir = state_dir
         self._max_bytes = max_bytes
+        self._flush_bytes = flush_bytes
+        self._flush_interval_secs = flush_interval_secs
+
+        # Encoded lines not yet written, per file
+        self._lock = threading.Lock()
+        self._jsonl_buf: List[bytes] = []
+        self._human_buf: List[bytes] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        # (epoch second, JSONL "time" string, human-log timestamp) for the
+        # most recent entry; both strings change at most once per second
+        self._time_cache = (-1, "", "")
+        # Open append handles and the size of each open file, by path; the
+        # size is tracked from our own writes so rotation needs no stat
+        self._files: Dict[str, BinaryIO] = {}
+        self._sizes: Dict[str, int] = {}
 
         os.makedirs(state_dir, exist_ok=True)
 
@@ -48,6 +94,8 @@ class OrchestrationLogger:
             self._console.addHandler(handler)
             self._console.setLevel(logging.DEBUG)
 
+        atexit.register(self.close)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -61,7 +109,7 @@ class OrchestrationLogger:
         self._log("warn", msg, fields)
 
     def error(self, msg: str, **fields: Any) -> None:
-        """Log an error message."""
+        """Log an error message (written through immediately)."""
         self._log("error", msg, fields)
 
     def learning(self, msg: str, **fields: Any) -> None:
@@ -73,69 +121,161 @@ class OrchestrationLogger:
         """
         self._log("learning", msg, fields)
 
+    def flush(self) -> None:
+        """Write all buffered entries to their files."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush buffered entries and close the files.
+
+        The logger stays usable afterwards; files are reopened on the
+        next write.
+        """
+        with self._lock:
+            self._flush_locked()
+            for path in list(self._files):
+                self._close_file(path)
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "OrchestrationLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
     def _log(self, level: str, msg: str, fields: Dict[str, Any]) -> None:
         """Route a log entry to both outputs and the console."""
-        self._write_jsonl(level, msg, fields)
-        self._write_human(level, msg)
+        with self._lock:
+            now = time.time()
+            iso_time, human_time = self._format_time(now)
+            self._write_jsonl(level, msg, fields, now, iso_time)
+            self._write_human(level, msg, human_time)
+            if (
+                level == "error"
+                or self._buffered_bytes >= self._flush_bytes
+                or time.monotonic() - self._last_flush >= self._flush_interval_secs
+            ):
+                self._flush_locked()
 
         # Mirror to Python's logging for console visibility
-        py_level = {
-            "debug": logging.DEBUG,
-            "info": logging.INFO,
-            "warn": logging.WARNING,
-            "error": logging.ERROR,
-            "learning": logging.INFO,
-        }.get(level, logging.INFO)
-        self._console.log(py_level, msg)
-
-    def _write_jsonl(self, level: str, msg: str, fields: Dict[str, Any]) -> None:
-        """Append a single JSON object to the JSONL log file."""
-        self._rotate_if_needed(self._jsonl_path)
+        self._console.log(_PY_LEVELS.get(level, logging.INFO), msg)
+
+    def _format_time(self, now: float) -> Tuple[str, str]:
+        """Local-time strings for *now*: (JSONL ``time``, human timestamp).
 
+        Formatted at most once per second; later entries in the same
+        second reuse the cached strings.
+        """
+        second = int(now)
+        cached_second, iso_time, human_time = self._time_cache
+        if second != cached_second:
+            local = time.localtime(second)
+            iso_time = time.strftime("%Y-%m-%dT%H:%M:%S%z", local)
+            human_time = time.strftime("%Y-%m-%d %H:%M:%S", local)
+            self._time_cache = (second, iso_time, human_time)
+        return iso_time, human_time
+
+    def _write_jsonl(
+        self,
+        level: str,
+        msg: str,
+        fields: Dict[str, Any],
+        now: float,
+        iso_time: str,
+    ) -> None:
+        """Buffer a single JSON object for the JSONL log file."""
         record: Dict[str, Any] = {
-            "ts": time.time(),
-            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime()),
+            "ts": now,
+            "time": iso_time,
             "level": level,
             "msg": msg,
         }
         if fields:
             record["fields"] = fields
 
-        try:
-            with open(self._jsonl_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, default=str) + "\n")
-        except OSError:
-            # If we cannot write, swallow silently — logging should never crash
-            pass
+        line = jsonio.dumps(record, default=str) + b"\n"
+        self._jsonl_buf.append(line)
+        self._buffered_bytes += len(line)
 
-    def _write_human(self, level: str, msg: str) -> None:
-        """Append a human-readable line to the text log file."""
-        self._rotate_if_needed(self._human_path)
+    def _write_human(self, level: str, msg: str, timestamp: str) -> None:
+        """Buffer a human-readable line for the text log file."""
+        tag = _LEVEL_TAGS.get(level) or level.upper().ljust(8)
+        line = f"{timestamp} [{tag}] {msg}\n".encode("utf-8")
+        self._human_buf.append(line)
+        self._buffered_bytes += len(line)
 
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        tag = level.upper().ljust(8)
-        line = f"{timestamp} [{tag}] {msg}\n"
+    def _flush_locked(self) -> None:
+        """Write out both buffers; the caller holds ``self._lock``."""
+        if self._jsonl_buf:
+            self._write_lines(self._jsonl_path, self._jsonl_buf)
+            self._jsonl_buf = []
+        if self._human_buf:
+            self._write_lines(self._human_path, self._human_buf)
+            self._human_buf = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
 
-        try:
-            with open(self._human_path, "a", encoding="utf-8") as f:
-                f.write(line)
-        except OSError:
-            pass
+    def _write_lines(self, path: str, lines: List[bytes]) -> None:
+        """Append *lines* to *path*, rotating between lines as needed.
+
+        The file is checked before each line exactly as if the lines had
+        been written one at a time, so batching never changes where a
+        rotation happens. The file is only stat'ed when it has no open
+        handle yet; after that its size is tracked from the writes.
+        """
+        size = self._sizes.get(path)
+        if size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+
+        start = 0
+        for i, line in enumerate(lines):
+            if size >= self._max_bytes:
+                self._append(path, lines[start:i])
+                self._close_file(path)
+                self._rotate(path)
+                start = i
+                size = 0
+            size += len(line)
+        self._append(path, lines[start:])
+        if path in self._files:
+            self._sizes[path] = size
 
-    def _rotate_if_needed(self, path: str) -> None:
-        """Rotate *path* to ``path.1`` if it exceeds the size limit."""
+    def _append(self, path: str, lines: List[bytes]) -> None:
+        """Append *lines* to *path* with a single write."""
+        if not lines:
+            return
         try:
-            size = os.path.getsize(path)
+            f = self._files.get(path)
+            if f is None:
+                # Unbuffered: each batch is already joined into one write
+                f = self._files[path] = open(path, "ab", buffering=0)
+            f.write(b"".join(lines))
         except OSError:
-            return
+            # If we cannot write, swallow silently — logging should never
+            # crash; drop the handle so the next write reopens the file
+            self._close_file(path)
 
-        if size < self._max_bytes:
-            return
+    def _close_file(self, path: str) -> None:
+        """Close and forget the open handle (and size) for *path*, if any."""
+        self._sizes.pop(path, None)
+        f = self._files.pop(path, None)
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
 
+    @staticmethod
+    def _rotate(path: str) -> None:
+        """Rotate *path* to ``path.1``."""
         rotated = path + ".1"
         try:
             # On POSIX this atomically replaces rotated if it exists.
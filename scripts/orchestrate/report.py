@@ -8,18 +8,22 @@ report.txt.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from . import jsonio
 from .config import CreationRule, MIN_POSITIVE_EVENTS_PER_VARIANT, MIN_BLOCKS_PER_VARIANT
 from .state import RunState, MonitorState, Experiment
 from .knowledge import KnowledgeBase
 
 logger = logging.getLogger(__name__)
 
+# Horizontal rules framing the report and each of its sections
+_HEAVY_RULE = "=" * 72
+_LIGHT_RULE = "-" * 72
+
 
 # =============================================================================
 # Public API
@@ -50,9 +54,9 @@ def generate_report(
     json_path = os.path.join(output_dir, "report.json")
     tmp_path = json_path + ".tmp"
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(report_data, f, indent=2)
-            f.write("\n")
+        payload = jsonio.dumps(report_data, indent=True) + b"\n"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
         os.replace(tmp_path, json_path)
         logger.info("Wrote structured report to %s", json_path)
     except OSError as exc:
@@ -240,10 +244,7 @@ def format_human_report(report_data: dict) -> str:
 
     # === Header ===
     header = report_data["header"]
-    lines.append("=" * 72)
-    lines.append("  ORCHESTRATION RUN REPORT")
-    lines.append("=" * 72)
-    lines.append("")
+    lines.extend((_HEAVY_RULE, "  ORCHESTRATION RUN REPORT", _HEAVY_RULE, ""))
     lines.append(f"  Run ID:       {header['run_id']}")
     lines.append(f"  Mode:         {header['mode']}")
     lines.append(f"  Duration:     {header['duration']}")
@@ -255,10 +256,7 @@ def format_human_report(report_data: dict) -> str:
 
     # === Creation Rules Learned ===
     rules = report_data["creation_rules_learned"]
-    lines.append("-" * 72)
-    lines.append("  CREATION RULES LEARNED")
-    lines.append("-" * 72)
-    lines.append("")
+    lines.extend(_section_header("CREATION RULES LEARNED"))
 
     if rules:
         for i, rule in enumerate(rules, 1):
@@ -277,10 +275,7 @@ def format_human_report(report_data: dict) -> str:
 
     # === Experiments Concluded ===
     concluded = report_data["experiments_concluded"]
-    lines.append("-" * 72)
-    lines.append("  EXPERIMENTS CONCLUDED")
-    lines.append("-" * 72)
-    lines.append("")
+    lines.extend(_section_header("EXPERIMENTS CONCLUDED"))
 
     if concluded:
         for i, exp in enumerate(concluded, 1):
@@ -298,10 +293,7 @@ def format_human_report(report_data: dict) -> str:
 
     # === Experiments Inconclusive ===
     inconclusive = report_data["experiments_inconclusive"]
-    lines.append("-" * 72)
-    lines.append("  EXPERIMENTS INCONCLUSIVE")
-    lines.append("-" * 72)
-    lines.append("")
+    lines.extend(_section_header("EXPERIMENTS INCONCLUSIVE"))
 
     if inconclusive:
         for i, exp in enumerate(inconclusive, 1):
@@ -325,10 +317,7 @@ def format_human_report(report_data: dict) -> str:
 
     # === Monitor Summary ===
     monitors = report_data["monitor_summary"]
-    lines.append("-" * 72)
-    lines.append("  MONITOR SUMMARY")
-    lines.append("-" * 72)
-    lines.append("")
+    lines.extend(_section_header("MONITOR SUMMARY"))
 
     if monitors:
         for mon in monitors:
@@ -351,10 +340,7 @@ def format_human_report(report_data: dict) -> str:
 
     # === Recommendations for Next Run ===
     recommendations = report_data["recommendations"]
-    lines.append("-" * 72)
-    lines.append("  RECOMMENDATIONS FOR NEXT RUN")
-    lines.append("-" * 72)
-    lines.append("")
+    lines.extend(_section_header("RECOMMENDATIONS FOR NEXT RUN"))
 
     if recommendations:
         for i, rec in enumerate(recommendations, 1):
@@ -364,7 +350,7 @@ def format_human_report(report_data: dict) -> str:
         lines.append("  No specific recommendations. All experiments concluded successfully.")
         lines.append("")
 
-    lines.append("=" * 72)
+    lines.append(_HEAVY_RULE)
     lines.append("")
 
     return "\n".join(lines)
@@ -375,6 +361,11 @@ def format_human_report(report_data: dict) -> str:
 # =============================================================================
 
 
+def _section_header(title: str) -> tuple:
+    """Lines opening a report section: rule, indented title, rule, blank."""
+    return (_LIGHT_RULE, f"  {title}", _LIGHT_RULE, "")
+
+
 def _compute_duration(started_at: str, now: datetime) -> str:
     """Compute human-readable duration from started_at ISO string to now."""
     try:
@@ -439,26 +430,24 @@ def _experiment_stats(exp: Experiment) -> tuple:
     Returns:
         A tuple of (delta, total_positive_events).
     """
-    blocks_a = [
-        b for b in exp.blocks
-        if b.variant == exp.variant_a and len(b.scores) > 0
-    ]
-    blocks_b = [
-        b for b in exp.blocks
-        if b.variant == exp.variant_b and len(b.scores) > 0
-    ]
-
-    all_scores_a = [s for b in blocks_a for s in b.scores]
-    all_scores_b = [s for b in blocks_b for s in b.scores]
+    # One pass over the scored blocks, using their running score totals
+    sum_a = sum_b = 0.0
+    count_a = count_b = 0
+    for b in exp.blocks:
+        if not b.scores:
+            continue
+        if b.variant == exp.variant_a:
+            sum_a += b.score_sum
+            count_a += len(b.scores)
+        if b.variant == exp.variant_b:
+            sum_b += b.score_sum
+            count_b += len(b.scores)
 
-    mean_a = sum(all_scores_a) / len(all_scores_a) if all_scores_a else 0.0
-    mean_b = sum(all_scores_b) / len(all_scores_b) if all_scores_b else 0.0
+    mean_a = sum_a / count_a if count_a else 0.0
+    mean_b = sum_b / count_b if count_b else 0.0
 
     delta = abs(mean_a - mean_b)
-
-    pos_a = sum(b.positive_events for b in blocks_a)
-    pos_b = sum(b.positive_events for b in blocks_b)
-    total_positive = pos_a + pos_b
+    total_positive = exp.positive_events_a + exp.positive_events_b
 
     return delta, total_positive
 
@@ -480,11 +469,8 @@ def _compute_needed(exp: Experiment, reason: str) -> str:
         )
 
     # insufficient_data: figure out what is missing
-    blocks_a = [b for b in exp.blocks if b.variant == exp.variant_a and len(b.scores) > 0]
-    blocks_b = [b for b in exp.blocks if b.variant == exp.variant_b and len(b.scores) > 0]
-
-    pos_a = sum(b.positive_events for b in blocks_a)
-    pos_b = sum(b.positive_events for b in blocks_b)
+    pos_a = exp.positive_events_a
+    pos_b = exp.positive_events_b
 
     needed_parts: List[str] = []
 
@@ -501,13 +487,13 @@ def _compute_needed(exp: Experiment, reason: str) -> str:
 
     # Check blocks
     min_blk = MIN_BLOCKS_PER_VARIANT
-    if len(blocks_a) < min_blk:
+    if exp.scored_blocks_a < min_blk:
         needed_parts.append(
-            f"{min_blk - len(blocks_a)} more blocks for variant A ('{exp.variant_a}')"
+            f"{min_blk - exp.scored_blocks_a} more blocks for variant A ('{exp.variant_a}')"
         )
-    if len(blocks_b) < min_blk:
+    if exp.scored_blocks_b < min_blk:
         needed_parts.append(
-            f"{min_blk - len(blocks_b)} more blocks for variant B ('{exp.variant_b}')"
+            f"{min_blk - exp.scored_blocks_b} more blocks for variant B ('{exp.variant_b}')"
         )
 
     if needed_parts:
@@ -9,18 +9,69 @@ import json
 import os
 import time
 import uuid
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Iterable, List, Optional
 
-from .config import EfficacyScore
+from . import jsonio
+from .config import DATACLASS_SLOTS, EfficacyScore, IntentScoring, resolve_intent_config
+
+# Observations/evaluations/scores retained per monitor, in memory and on disk
+HISTORY_LEN = 100
+
+# Detection latencies retained per monitor (the window avg_detection_latency
+# is computed over)
+LATENCY_HISTORY_LEN = 50
+
+
+def _history(items: Iterable = (), maxlen: int = HISTORY_LEN) -> Deque:
+    """Return a bounded history; appends past *maxlen* evict the oldest."""
+    return deque(items, maxlen=maxlen)
+
+
+def _latency_history(items: Iterable = ()) -> Deque:
+    """Return a bounded detection-latency history (LATENCY_HISTORY_LEN)."""
+    return _history(items, LATENCY_HISTORY_LEN)
+
+
+def _score_array(items: Iterable = ()) -> array:
+    """Return a packed array of doubles (8 bytes/score vs a boxed float)."""
+    return array("d", items)
+
+
+# =============================================================================
+# Timestamps
+# =============================================================================
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recent utc_iso_now() call;
+# a single tuple so concurrent callers never see a mismatched pair
+_iso_second_cache = (-1, "")
+
+
+def utc_iso_now() -> str:
+    """Return the current UTC time as a naive ISO-8601 string.
+
+    Same format as ``datetime.utcnow().isoformat()`` (always with
+    microseconds). The date/time prefix is formatted at most once per
+    second; only the fractional part is formatted per call.
+    """
+    global _iso_second_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
 
 
 # =============================================================================
 # Observation (single check result)
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Observation:
     """Result of a single kto check cycle."""
 
@@ -67,7 +118,7 @@ class Observation:
 # Evaluation (classification of a check result)
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Evaluation:
     """Classification of an observation against ground truth."""
 
@@ -108,16 +159,27 @@ class ExperimentBlock:
     variant: str = ""
     start_cycle: int = 0
     end_cycle: Optional[int] = None
-    scores: List[float] = field(default_factory=list)
+    scores: array = field(default_factory=_score_array)  # typecode "d"
     positive_events: int = 0  # TP count
     negative_events: int = 0  # TN count
 
+    # Running total of scores; not persisted, kept current by add_score()
+    score_sum: float = field(default=0.0, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.score_sum = sum(self.scores)
+
+    def add_score(self, score: float) -> None:
+        """Append a score and update the running total."""
+        self.scores.append(score)
+        self.score_sum += score
+
     def to_dict(self) -> dict:
         return {
             "variant": self.variant,
             "start_cycle": self.start_cycle,
             "end_cycle": self.end_cycle,
-            "scores": self.scores,
+            "scores": self.scores.tolist(),
             "positive_events": self.positive_events,
             "negative_events": self.negative_events,
         }
@@ -128,7 +190,7 @@ class ExperimentBlock:
             variant=d.get("variant", ""),
             start_cycle=d.get("start_cycle", 0),
             end_cycle=d.get("end_cycle"),
-            scores=d.get("scores", []),
+            scores=_score_array(d.get("scores", [])),
             positive_events=d.get("positive_events", 0),
             negative_events=d.get("negative_events", 0),
         )
@@ -154,6 +216,35 @@ class Experiment:
     winner: Optional[str] = None
     conclusion_evidence: str = ""
 
+    # Derived from blocks; not persisted, rebuilt by refresh_blocks():
+    # start_cycle of each block, for bisecting the active block, and the
+    # index of the block last looked up
+    block_starts: List[int] = field(
+        default_factory=list, init=False, compare=False, repr=False
+    )
+    last_block_idx: int = field(default=0, init=False, compare=False, repr=False)
+    # Per-variant positive events and blocks holding at least one score,
+    # kept current by record_observation() so conclude_experiment() can
+    # rule out an under-powered experiment without scanning blocks
+    positive_events_a: int = field(default=0, init=False, compare=False, repr=False)
+    positive_events_b: int = field(default=0, init=False, compare=False, repr=False)
+    scored_blocks_a: int = field(default=0, init=False, compare=False, repr=False)
+    scored_blocks_b: int = field(default=0, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.refresh_blocks()
+
+    def refresh_blocks(self) -> None:
+        """Rebuild the block-derived fields after ``blocks`` is replaced."""
+        self.block_starts = [b.start_cycle for b in self.blocks]
+        self.last_block_idx = 0
+        scored_a = [b for b in self.blocks if b.scores and b.variant == self.variant_a]
+        scored_b = [b for b in self.blocks if b.scores and b.variant == self.variant_b]
+        self.positive_events_a = sum(b.positive_events for b in scored_a)
+        self.positive_events_b = sum(b.positive_events for b in scored_b)
+        self.scored_blocks_a = len(scored_a)
+        self.scored_blocks_b = len(scored_b)
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -191,7 +282,7 @@ class Experiment:
 # Monitor State
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MonitorState:
     """State for a single monitored watch."""
 
@@ -202,9 +293,9 @@ class MonitorState:
     mode: str = "e2e"
     cycle_count: int = 0
     interval_secs: int = 300
-    observations: List[Observation] = field(default_factory=list)
-    evaluations: List[Evaluation] = field(default_factory=list)
-    scores: List[float] = field(default_factory=list)
+    observations: Deque[Observation] = field(default_factory=_history)
+    evaluations: Deque[Evaluation] = field(default_factory=_history)
+    scores: Deque[float] = field(default_factory=_history)
     current_config: Dict[str, str] = field(default_factory=dict)
     active_experiment_id: Optional[str] = None
 
@@ -219,7 +310,56 @@ class MonitorState:
     agent_total_decisions: int = 0
 
     # Latency tracking (cycles to first detection after change)
-    detection_latencies: List[int] = field(default_factory=list)
+    detection_latencies: Deque[int] = field(default_factory=_latency_history)
+
+    # Rates derived from the confusion matrix; not persisted, kept current
+    # by refresh_rates() whenever tp/fp/fn change
+    precision: float = field(default=0.0, init=False, compare=False)
+    recall: float = field(default=0.0, init=False, compare=False)
+    f1: float = field(default=0.0, init=False, compare=False)
+
+    # Mean of detection_latencies; not persisted, kept current by
+    # record_detection_latency() / refresh_latency_mean()
+    avg_detection_latency: float = field(default=0.0, init=False, compare=False)
+    _latency_sum: int = field(default=0, init=False, compare=False, repr=False)
+
+    # Scoring weights/thresholds for intent_type, resolved once (not persisted)
+    scoring: IntentScoring = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.scoring = resolve_intent_config(self.intent_type)
+        self.refresh_rates()
+        self.refresh_latency_mean()
+
+    def refresh_rates(self) -> None:
+        """Recompute precision, recall, and F1 from the confusion matrix."""
+        tp = self.tp
+        self.precision = tp / (tp + self.fp) if (tp + self.fp) > 0 else 0.0
+        self.recall = tp / (tp + self.fn) if (tp + self.fn) > 0 else 0.0
+        self.f1 = (
+            2.0 * (self.precision * self.recall) / (self.precision + self.recall)
+            if (self.precision + self.recall) > 0
+            else 0.0
+        )
+
+    def record_detection_latency(self, latency: int) -> None:
+        """Append a detection latency, keeping the last 50, and update the mean."""
+        latencies = self.detection_latencies
+        if len(latencies) == latencies.maxlen:
+            # The append below evicts the oldest entry
+            self._latency_sum -= latencies[0]
+        latencies.append(latency)
+        self._latency_sum += latency
+        self.avg_detection_latency = self._latency_sum / len(self.detection_latencies)
+
+    def refresh_latency_mean(self) -> None:
+        """Recompute the detection latency mean from scratch (after a load)."""
+        self._latency_sum = sum(self.detection_latencies)
+        self.avg_detection_latency = (
+            self._latency_sum / len(self.detection_latencies)
+            if self.detection_latencies
+            else 0.0
+        )
 
     def to_dict(self) -> dict:
         return {
@@ -230,9 +370,9 @@ class MonitorState:
             "mode": self.mode,
             "cycle_count": self.cycle_count,
             "interval_secs": self.interval_secs,
-            "observations": [o.to_dict() for o in self.observations[-100:]],  # cap at 100
-            "evaluations": [e.to_dict() for e in self.evaluations[-100:]],
-            "scores": self.scores[-100:],
+            "observations": [o.to_dict() for o in self.observations],
+            "evaluations": [e.to_dict() for e in self.evaluations],
+            "scores": list(self.scores),
             "current_config": self.current_config,
             "active_experiment_id": self.active_experiment_id,
             "tp": self.tp,
@@ -241,13 +381,13 @@ class MonitorState:
             "fn": self.fn,
             "agent_correct_decisions": self.agent_correct_decisions,
             "agent_total_decisions": self.agent_total_decisions,
-            "detection_latencies": self.detection_latencies[-50:],
+            "detection_latencies": list(self.detection_latencies),
         }
 
     @classmethod
     def from_dict(cls, d: dict) -> "MonitorState":
-        observations = [Observation.from_dict(o) for o in d.get("observations", [])]
-        evaluations = [Evaluation.from_dict(e) for e in d.get("evaluations", [])]
+        observations = _history(Observation.from_dict(o) for o in d.get("observations", []))
+        evaluations = _history(Evaluation.from_dict(e) for e in d.get("evaluations", []))
         return cls(
             name=d.get("name", ""),
             watch_name=d.get("watch_name", ""),
@@ -258,7 +398,7 @@ class MonitorState:
             interval_secs=d.get("interval_secs", 300),
             observations=observations,
             evaluations=evaluations,
-            scores=d.get("scores", []),
+            scores=_history(d.get("scores", [])),
             current_config=d.get("current_config", {}),
             active_experiment_id=d.get("active_experiment_id"),
             tp=d.get("tp", 0),
@@ -267,7 +407,7 @@ class MonitorState:
             fn=d.get("fn", 0),
             agent_correct_decisions=d.get("agent_correct_decisions", 0),
             agent_total_decisions=d.get("agent_total_decisions", 0),
-            detection_latencies=d.get("detection_latencies", []),
+            detection_latencies=_latency_history(d.get("detection_latencies", [])),
         )
 
 
@@ -321,16 +461,41 @@ class RunState:
 # Atomic Persistence
 # =============================================================================
 
-def save_state_atomic(state: RunState, path: str) -> None:
-    """Write state to disk atomically (write to .tmp then rename)."""
+def save_state_atomic(state: RunState, path: str, durable: bool = False) -> None:
+    """Write state to disk atomically (write to .tmp then rename).
+
+    The rename alone keeps the file crash-consistent. With ``durable=True``
+    the data and the parent directory entry are also fsynced, which is
+    much slower and only worth it for checkpoints that must survive power
+    loss (initial setup, final shutdown).
+    """
     tmp_path = path + ".tmp"
-    data = state.to_dict()
-    with open(tmp_path, "w") as f:
-        json.dump(data, f, indent=2)
+    payload = jsonio.dumps(state.to_dict(), indent=True)
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
     os.replace(tmp_path, path)
+    if durable:
+        fsync_dir(os.path.dirname(path) or ".")
     state.last_save_time = time.time()
 
 
+def fsync_dir(dir_path: str) -> None:
+    """Fsync a directory so a preceding rename is persisted (POSIX only)."""
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def load_state(path: str) -> Optional[RunState]:
     """Load state from disk. Returns None if file doesn't exist."""
     if not os.path.exists(path):
@@ -338,3 +503,143 @@ def load_state(path: str) -> Optional[RunState]:
     with open(path, "r") as f:
         data = json.load(f)
     return RunState.from_dict(data)
+
+
+# =============================================================================
+# Write-Ahead Log (per-cycle deltas between full checkpoints)
+# =============================================================================
+
+# MonitorState scalars copied verbatim into each WAL record
+_WAL_MONITOR_FIELDS = (
+    "cycle_count",
+    "tp",
+    "tn",
+    "fp",
+    "fn",
+    "agent_correct_decisions",
+    "agent_total_decisions",
+    "active_experiment_id",
+    "current_config",
+)
+
+
+class StateWAL:
+    """Append-only JSONL log of per-cycle monitor deltas.
+
+    Each record holds what one monitor cycle added to the state: the new
+    observation, evaluation and score, the monitor's counters, and any
+    experiments the cycle touched. Appending is O(delta) whereas
+    :func:`save_state_atomic` rewrites the full RunState, so the full
+    checkpoint can run far less often. After a checkpoint the WAL is
+    truncated. Replay is idempotent: records at or below a monitor's
+    checkpointed ``cycle_count`` are skipped.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = 0  # bytes appended since the last reset
+        self._fh = None
+
+    def append(
+        self,
+        state: RunState,
+        monitor_names: Iterable[str],
+        prev_experiment_ids: Dict[str, Optional[str]],
+    ) -> None:
+        """Append one record per monitor that just completed a cycle.
+
+        Args:
+            state: The run state after the cycle(s).
+            monitor_names: Monitors that ran this round.
+            prev_experiment_ids: Active experiment id per monitor before the
+                round, so experiments concluded this round are captured.
+        """
+        lines = []
+        for name in monitor_names:
+            mon = state.monitors.get(name)
+            if mon is None or not mon.observations:
+                continue
+            exp_ids = {prev_experiment_ids.get(name), mon.active_experiment_id}
+            record = {
+                "run_id": state.run_id,
+                "monitor": name,
+                "total_cycles": state.total_cycles,
+                "observation": mon.observations[-1].to_dict(),
+                "evaluation": mon.evaluations[-1].to_dict() if mon.evaluations else None,
+                "score": mon.scores[-1] if mon.scores else None,
+                "experiments": {
+                    eid: state.experiments[eid].to_dict()
+                    for eid in exp_ids
+                    if eid is not None and eid in state.experiments
+                },
+            }
+            for attr in _WAL_MONITOR_FIELDS:
+                record[attr] = getattr(mon, attr)
+            record["detection_latencies"] = list(mon.detection_latencies)
+            lines.append(jsonio.dumps(record))
+        if not lines:
+            return
+        payload = b"\n".join(lines) + b"\n"
+        if self._fh is None:
+            self._fh = open(self.path, "ab", buffering=0)
+        self._fh.write(payload)
+        self.size += len(payload)
+
+    def replay(self, state: RunState) -> int:
+        """Apply WAL records on top of a loaded checkpoint.
+
+        Stops at the first unreadable line (e.g. a write torn by a crash).
+
+        Returns:
+            Number of records applied.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                raw_lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+
+        applied = 0
+        for raw in raw_lines:
+            try:
+                rec = jsonio.loads(raw)
+            except ValueError:
+                break
+            if rec.get("run_id") != state.run_id:
+                continue
+            mon = state.monitors.get(rec.get("monitor", ""))
+            if mon is None or rec.get("cycle_count", 0) <= mon.cycle_count:
+                continue
+
+            mon.observations.append(Observation.from_dict(rec["observation"]))
+            if rec.get("evaluation") is not None:
+                mon.evaluations.append(Evaluation.from_dict(rec["evaluation"]))
+            if rec.get("score") is not None:
+                mon.scores.append(rec["score"])
+            for attr in _WAL_MONITOR_FIELDS:
+                if attr in rec:
+                    setattr(mon, attr, rec[attr])
+            if "detection_latencies" in rec:
+                mon.detection_latencies = _latency_history(rec["detection_latencies"])
+            mon.refresh_rates()
+            mon.refresh_latency_mean()
+            for eid, exp in rec.get("experiments", {}).items():
+                state.experiments[eid] = Experiment.from_dict(exp)
+            state.total_cycles = max(state.total_cycles, rec.get("total_cycles", 0))
+            applied += 1
+        return applied
+
+    def reset(self) -> None:
+        """Discard all records (call after a full checkpoint)."""
+        self.close()
+        self.size = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Close the append handle, if open."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None